@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+asyncio benchmark: event loop responsiveness while documents render
+
+Renders the sample proposal (extended to about 20 pages) several times
+from one event loop while a ticker measures how late the loop wakes up:
+blocking calls in the coroutine, render_pdf_async on its thread pool and
+render_pdf_async on a process pool.
+
+Usage (from proposal_generator/):
+    python benchmarks/async_benchmark.py [documents]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hhn_pdf_generator.core.async_render import AsyncRenderer
+from hhn_pdf_generator.core.render import DocumentSpec, render
+
+SAMPLE = os.path.join(ROOT, 'proposal_english.md')
+TICK = 0.005
+
+
+def create_proposal():
+    """The sample proposal with sections appended up to about 20 pages"""
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        text = f.read()
+    section = "\n\n## Additional Section\n\n" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40 + "\n"
+    return text + section * 22
+
+
+async def ticker(lags):
+    """Record how much later than scheduled the loop runs this coroutine"""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def measure(jobs):
+    """Run the jobs concurrently; returns (seconds, worst loop lag in seconds)"""
+    lags = []
+    tick = asyncio.ensure_future(ticker(lags))
+    await asyncio.sleep(TICK * 2)
+    start = time.perf_counter()
+    await asyncio.gather(*jobs)
+    seconds = time.perf_counter() - start
+    await asyncio.sleep(TICK * 2)  # Let the ticker record a wake-up delayed by the last job
+    tick.cancel()
+    return seconds, max(lags)
+
+
+async def blocking(markdown):
+    render(DocumentSpec(markdown, use_cache=False))
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    markdown = create_proposal()
+    results = []
+
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        results.append(('blocking', await measure([blocking(markdown) for _ in range(count)])))
+
+        async with AsyncRenderer() as renderer:
+            await renderer.render(markdown, use_cache=False)  # Fetch logos, load modules
+            jobs = [renderer.render(markdown, use_cache=False) for _ in range(count)]
+            results.append(('thread pool', await measure(jobs)))
+
+        with ProcessPoolExecutor() as executor:
+            async with AsyncRenderer(executor) as renderer:
+                await renderer.render(markdown, use_cache=False)
+                jobs = [renderer.render(markdown, use_cache=False) for _ in range(count)]
+                results.append(('process pool', await measure(jobs)))
+
+    print(f"{count} documents of about 20 pages, {os.cpu_count()} CPU(s)")
+    for label, (seconds, lag) in results:
+        print(f"  {label:<13} {seconds*1000:8.0f} ms total, worst event loop lag {lag*1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Block grouping benchmark: one flowable per source line vs. per markdown block
+
+The per-line numbers are produced by parsing the same text with a blank line
+after every line, which is how the parser treated hard-wrapped paragraphs,
+multi-line list items and quotes before lines were grouped into blocks.
+Every file is measured as written and hard-wrapped at 72 columns, the way
+many editors save prose.
+
+Usage (from proposal_generator/):
+    python benchmarks/block_grouping_benchmark.py [file.md ...]
+"""
+
+import os
+import re
+import sys
+import glob
+import time
+import textwrap
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from hhn_pdf_generator.core.styles import StyleManager
+from hhn_pdf_generator.core.template import PageTrackingDocTemplate
+from hhn_pdf_generator.utils.markdown_parser import MarkdownParser
+
+
+def read_body(path):
+    """Markdown lines of a file without its YAML front matter"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    if lines and lines[0].strip() == '---' and '---' in (line.strip() for line in lines[1:]):
+        end = next(i for i, line in enumerate(lines[1:], 1) if line.strip() == '---')
+        lines = lines[end + 1:]
+    return lines
+
+
+def hard_wrap(lines, width=72):
+    """Wrap long paragraph, list and quote lines like an editor would"""
+    wrapped = []
+    in_code_block = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith('```'):
+            in_code_block = not in_code_block
+        if in_code_block or stripped.startswith(('#', '```')) or len(line) <= width:
+            wrapped.append(line)
+            continue
+
+        indent = line[:len(line) - len(line.lstrip())]
+        marker = re.match(r'([-*>]|\d+\.)\s+', stripped)
+        continuation = indent + ('> ' if stripped.startswith('>') else ' ' * len(marker.group(0)) if marker else '')
+        wrapped.extend(textwrap.wrap(line, width, initial_indent='', subsequent_indent=continuation,
+                                     break_long_words=False, break_on_hyphens=False))
+    return wrapped
+
+
+def one_block_per_line(lines):
+    """Separate every line from the next so that no lines are grouped"""
+    spaced = []
+    for line in lines:
+        spaced.extend((line, ''))
+    return spaced
+
+
+def measure(lines, styles, runs=3):
+    """Parse and lay out lines; returns (flowables, best seconds)"""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        flowables = MarkdownParser().parse_markdown_content('\n'.join(lines), styles)
+        doc = PageTrackingDocTemplate(layout_only=True)
+        doc.build(list(flowables))
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return len(flowables), best
+
+
+def main():
+    paths = sys.argv[1:] or (
+        sorted(glob.glob(os.path.join(PROJECT_DIR, '*.md'))) +
+        sorted(glob.glob(os.path.join(os.path.dirname(PROJECT_DIR), '*.md')))
+    )
+    styles = StyleManager().get_styles()
+
+    print(f"{'file':<40} {'per line':>16} {'per block':>16}")
+    totals = [0, 0.0, 0, 0.0]
+    for path in paths:
+        for label, lines in ((os.path.basename(path), read_body(path)),
+                             (os.path.basename(path) + " (wrapped)", hard_wrap(read_body(path)))):
+            try:
+                before = measure(one_block_per_line(lines), styles)
+                after = measure(lines, styles)
+            except ValueError as e:
+                print(f"{label:<40} skipped: {str(e).strip().splitlines()[-1][:60]}")
+                continue
+            for i, value in enumerate(before + after):
+                totals[i] += value
+            print(f"{label:<40} {before[0]:6d} {before[1]*1000:7.1f} ms "
+                  f"{after[0]:6d} {after[1]*1000:7.1f} ms")
+
+    print(f"{'total':<40} {totals[0]:6d} {totals[1]*1000:7.1f} ms {totals[2]:6d} {totals[3]*1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Code block benchmark: layout time of fenced code listings by length
+
+Lays out listings of increasing length (layout only, no drawing) and prints
+the time per listing line, which should stay flat as listings grow.
+
+Usage (from proposal_generator/):
+    python benchmarks/code_block_benchmark.py [max_lines]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hhn_pdf_generator.core.styles import StyleManager
+from hhn_pdf_generator.core.template import PageTrackingDocTemplate
+from hhn_pdf_generator.utils.markdown_parser import MarkdownParser
+
+
+def listing(lines):
+    """Markdown with one fenced code block of the given number of lines"""
+    code = '\n'.join(
+        f"    result_{i} = transform(items[{i}], scale=0.5) if items[{i}] < limit else None  # <{i}> & more"
+        for i in range(lines)
+    )
+    return f"Listing:\n\n```python\n{code}\n```\n"
+
+
+def main():
+    max_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 16000
+    styles = StyleManager().get_styles()
+
+    lines = 500
+    print(f"{'lines':>8} {'pages':>6} {'layout':>10} {'per line':>10}")
+    while lines <= max_lines:
+        flowables = MarkdownParser().parse_markdown_content(listing(lines), styles)
+        doc = PageTrackingDocTemplate(layout_only=True)
+        start = time.perf_counter()
+        doc.build(flowables)
+        seconds = time.perf_counter() - start
+        print(f"{lines:8d} {doc.page:6d} {seconds*1000:8.1f} ms {seconds/lines*1e6:7.1f} µs")
+        lines *= 2
+
+
+if __name__ == "__main__":
+    main()
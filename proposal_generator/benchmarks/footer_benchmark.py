@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Footer benchmark: static footer drawn on every page vs. shared form XObject
+
+Usage (from proposal_generator/):
+    python benchmarks/footer_benchmark.py [pages] [hhn_logo.jpg unitylab_logo.png]
+"""
+
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.lib.pagesizes import A4
+
+from hhn_pdf_generator.generators.header_footer import HeaderFooterGenerator
+
+
+class _Doc:
+    content_page_offset = 1
+
+
+def render(header_footer, pages, use_form):
+    """Render empty pages with footers and return (seconds, pdf_bytes)"""
+    buffer = BytesIO()
+    canvas = Canvas(buffer, pagesize=A4)
+    doc = _Doc()
+    start = time.perf_counter()
+    for page in range(pages):
+        if use_form:
+            header_footer.create_header_footer(canvas, doc)
+        elif page > 0:
+            canvas.saveState()
+            header_footer.draw_static_footer(canvas)
+            canvas.setFont('Helvetica', 9)
+            canvas.drawCentredString(A4[0]/2, 20, f"Page {page}")
+            canvas.restoreState()
+        canvas.showPage()
+    canvas.save()
+    return time.perf_counter() - start, buffer.getvalue()
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    university_info = {
+        'name': 'Hochschule Heilbronn',
+        'subtitle': 'University of Applied Sciences'
+    }
+    header_footer = HeaderFooterGenerator(university_info, *sys.argv[2:4])
+
+    for label, use_form in (("per-page drawing", False), ("form XObject", True)):
+        seconds, pdf = render(header_footer, pages, use_form)
+        print(f"{label:<18} {pages} pages: {seconds*1000:8.1f} ms, {len(pdf)/1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Syntax highlighting benchmark: lexing, token cache hits and rendering cost
+
+Highlights a generated Python listing with an empty token cache, from the
+disk cache (new process) and from the in-memory cache (next pass or watch
+rebuild), then renders it plain and highlighted. Needs Pygments.
+
+Usage (from proposal_generator/):
+    python benchmarks/highlight_benchmark.py [lines]
+"""
+
+import os
+import sys
+import time
+import tempfile
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hhn_pdf_generator.core.config import Config
+from hhn_pdf_generator.core.styles import StyleManager
+from hhn_pdf_generator.core.template import PageTrackingDocTemplate
+from hhn_pdf_generator.utils import syntax_highlighter
+from hhn_pdf_generator.utils.code_listing import CodeListing
+
+
+def listing(lines):
+    """Python source with a realistic mix of tokens"""
+    source = []
+    for i in range(lines):
+        if i % 10 == 0:
+            source.append(f"def step_{i}(items, limit={i}):")
+        elif i % 10 == 9:
+            source.append(f"    return total  # step {i} done")
+        else:
+            source.append(f"    total = sum(x * {i} for x in items if x < limit) + len('item {i}')")
+    return source
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def render(lines, style):
+    doc = PageTrackingDocTemplate(BytesIO())
+    doc.build([CodeListing(lines, style)])
+    return doc.page
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    if syntax_highlighter.pygments_version() is None:
+        print("Pygments is not installed, code blocks are drawn without highlighting")
+        return
+
+    lines = listing(count)
+    style = StyleManager().get_styles()['CodeBlock']
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        Config.TOKEN_CACHE_DIR = cache_dir
+        highlighted, lex_seconds = timed(syntax_highlighter.highlight, lines, 'python')
+        syntax_highlighter._highlight_cache.clear()
+        _, disk_seconds = timed(syntax_highlighter.highlight, lines, 'python')
+        _, memory_seconds = timed(syntax_highlighter.highlight, lines, 'python')
+
+    pages, plain_seconds = timed(render, lines, style)
+    _, highlighted_seconds = timed(render, highlighted, style)
+
+    print(f"{count} lines, {pages} pages")
+    print(f"   lex (empty cache)       {lex_seconds*1000:8.1f} ms")
+    print(f"   token cache on disk     {disk_seconds*1000:8.1f} ms")
+    print(f"   token cache in memory   {memory_seconds*1000:8.1f} ms")
+    print(f"   render plain            {plain_seconds*1000:8.1f} ms")
+    print(f"   render highlighted      {highlighted_seconds*1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Image benchmark: PDF size and render time of documents with large images
+
+Renders a document with 4K screenshots and photos three times: embedded at
+full resolution, downscaled with an empty image cache and downscaled with
+the cache filled by the previous run.
+
+Usage (from proposal_generator/):
+    python benchmarks/image_benchmark.py [images]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from hhn_pdf_generator.core.config import Config
+from hhn_pdf_generator.core.styles import StyleManager
+from hhn_pdf_generator.core.template import PageTrackingDocTemplate
+from hhn_pdf_generator.utils import image_cache
+from hhn_pdf_generator.utils.markdown_parser import MarkdownParser
+
+
+def create_images(directory, count):
+    """Write count 4K images, alternating screenshots (PNG) and photos (JPEG)"""
+    rng = random.Random(1)
+    names = []
+    for i in range(count):
+        if i % 2 == 0:
+            img = Image.new('RGB', (3840, 2160), (240, 240, 245))
+            draw = ImageDraw.Draw(img)
+            for _ in range(300):
+                x, y = rng.randrange(3600), rng.randrange(2000)
+                color = tuple(rng.randrange(256) for _ in range(3))
+                draw.rectangle([x, y, x + rng.randrange(20, 400), y + rng.randrange(10, 60)], fill=color)
+            for j in range(2000):
+                draw.text((rng.randrange(3800), rng.randrange(2150)), f"Label {j}", fill=(0, 0, 0))
+            name = f"screenshot_{i}.png"
+        else:
+            img = Image.effect_noise((3840, 2160), 40).convert('RGB')
+            name = f"photo_{i}.jpg"
+        img.save(os.path.join(directory, name), quality=95)
+        names.append(name)
+    return names
+
+
+def render(markdown, base_dir, styles):
+    """Render markdown into memory; returns (seconds, pdf size in bytes)"""
+    start = time.perf_counter()
+    parser = MarkdownParser()
+    parser.base_dir = base_dir
+    buffer = BytesIO()
+    PageTrackingDocTemplate(buffer).build(parser.parse_markdown_content(markdown, styles))
+    return time.perf_counter() - start, len(buffer.getvalue())
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    styles = StyleManager().get_styles()
+
+    with tempfile.TemporaryDirectory() as directory:
+        names = create_images(directory, count)
+        markdown = "\n\n".join(f"Figure {i}:\n\n![Figure {i}]({name})" for i, name in enumerate(names))
+        Config.IMAGE_CACHE_DIR = os.path.join(directory, 'cache')
+
+        dpi = Config.IMAGE_DPI
+        Config.IMAGE_DPI = 10**6  # Never downscale
+        full = render(markdown, directory, styles)
+        Config.IMAGE_DPI = dpi
+
+        image_cache._fitted_images.clear()
+        cold = render(markdown, directory, styles)
+        image_cache._fitted_images.clear()
+        warm = render(markdown, directory, styles)
+
+    print(f"{count} 4K images, downscaled to {Config.IMAGE_DPI} DPI")
+    for label, (seconds, size) in (('full resolution', full), ('cold cache', cold), ('warm cache', warm)):
+        print(f"  {label:<16} {seconds*1000:8.0f} ms {size / 1e6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
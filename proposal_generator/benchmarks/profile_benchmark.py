@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Output profile benchmark: PDF size and build time per --profile
+
+Renders a long text document with screenshots and photos through the full
+generator, once with the default settings and once per entry of
+Config.OUTPUT_PROFILES. Every run starts with empty image and output caches.
+
+Usage (from proposal_generator/):
+    python benchmarks/profile_benchmark.py [sections]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_benchmark import create_images
+
+from hhn_pdf_generator.core.config import Config
+from hhn_pdf_generator.core.generator import UniversalMarkdownToPDF
+from hhn_pdf_generator.utils import image_cache
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'proposal_english.md')
+
+
+def front_matter():
+    """YAML front matter of the sample proposal, including its delimiters"""
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        text = f.read()
+    return text[:text.index('\n---', 3) + 4] + '\n'
+
+
+def create_document(directory, sections):
+    """Write a markdown file with sections of text, a table and one image each"""
+    names = create_images(directory, min(sections, 4))
+    parts = [front_matter()]
+    for i in range(sections):
+        parts.append(f"# Section {i}\n")
+        parts.append(("Body text with **bold** and *italic* words. " * 12 + "\n\n") * 4)
+        parts.append("| Name | Value |\n|---|---:|\n" + "".join(f"| Row {j} | {j * 7} |\n" for j in range(10)))
+        parts.append(f"\n![Figure {i}]({names[i % len(names)]})\n")
+    path = os.path.join(directory, 'profile.md')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(parts))
+    return path
+
+
+def render(input_file, output_file, cache_dir):
+    """Render input_file with empty caches; returns (seconds, pdf size in bytes)"""
+    Config.IMAGE_CACHE_DIR = os.path.join(cache_dir, 'images')
+    image_cache._fitted_images.clear()
+    image_cache._reused_paths.clear()
+    converter = UniversalMarkdownToPDF(input_file)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        converter.generate_pdf(input_file, output_file, use_cache=False)
+    return time.perf_counter() - start, os.path.getsize(output_file)
+
+
+def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    defaults = {setting: getattr(Config, setting) for setting in Config.OUTPUT_PROFILES['fast']}
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_file = create_document(directory, sections)
+        output_file = os.path.join(directory, 'profile.pdf')
+
+        results = [('default', render(input_file, output_file, os.path.join(directory, 'default')))]
+        for name in Config.OUTPUT_PROFILES:
+            Config.apply_profile(name)
+            results.append((name, render(input_file, output_file, os.path.join(directory, name))))
+            for setting, value in defaults.items():
+                setattr(Config, setting, value)
+            Config.OUTPUT_PROFILE = None
+
+    print(f"{sections} sections with text, tables and 4K images")
+    for label, (seconds, size) in results:
+        print(f"  {label:<8} {seconds*1000:8.0f} ms {size / 1e6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Render server benchmark: request latency against a fresh CLI process
+
+Starts the render server on a free local port and posts a proposal of
+about 20 pages repeatedly (output cache off, so every request renders),
+then converts the same file once with a new `main.py` process.
+
+Usage (from proposal_generator/):
+    python benchmarks/server_benchmark.py [requests]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+import subprocess
+import urllib.request
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hhn_pdf_generator.server import RenderService, create_server
+
+SAMPLE = os.path.join(ROOT, 'proposal_english.md')
+
+
+def create_proposal():
+    """The sample proposal with sections appended up to about 20 pages"""
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        text = f.read()
+    section = "\n\n## Additional Section\n\n" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40 + "\n"
+    return text + section * 22
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    markdown = create_proposal().encode('utf-8')
+
+    service = RenderService(workers=1, use_cache=False)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        service.start()
+    server = create_server(service, '127.0.0.1', 0)
+    server.RequestHandlerClass.log_message = lambda *args: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/render"
+
+    latencies = []
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            with urllib.request.urlopen(urllib.request.Request(url, data=markdown)) as response:
+                response.read()
+            latencies.append(time.perf_counter() - start)
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_file = os.path.join(directory, 'proposal.md')
+        with open(input_file, 'wb') as f:
+            f.write(markdown)
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-m', 'hhn_pdf_generator.main', input_file, '-o', os.path.join(directory, 'out.pdf'), '--no-cache'],
+            cwd=ROOT, stdout=subprocess.DEVNULL, check=True
+        )
+        cli = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{count} requests, one warm worker, output cache off")
+    print(f"  server p50 {latencies[len(latencies) // 2]*1000:8.0f} ms")
+    print(f"  server p95 {latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]*1000:8.0f} ms")
+    print(f"  new CLI    {cli*1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
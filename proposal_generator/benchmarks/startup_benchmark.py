@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: interpreter startup and import cost of the CLI
+
+Runs `main.py --help` and a full converter import in fresh interpreters with
+`-X importtime` and compares the package's own import time with the budget.
+Exits with status 1 if a budget is exceeded.
+
+Usage (from proposal_generator/):
+    python benchmarks/startup_benchmark.py [runs]
+"""
+
+import os
+import sys
+import statistics
+import subprocess
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budgets in milliseconds
+BUDGETS_MS = {
+    'hhn_pdf_generator': 10,  # Package import, all that `--help` needs
+}
+
+SCENARIOS = [
+    ("python -c pass", ['-c', 'pass']),
+    ("main.py --help", ['-m', 'hhn_pdf_generator.main', '--help']),
+    ("import converter", ['-c', 'import hhn_pdf_generator.core.generator']),
+]
+
+
+def run(args):
+    """Run a fresh interpreter and return (wall_ms, {module: cumulative_ms}, top_level)"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args,
+        cwd=PROJECT_DIR, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    imports = {}
+    top_level = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        name = module.strip()
+        imports[name] = int(cumulative) / 1000
+        # Nested imports are indented by two spaces per level
+        if len(module) - len(module.lstrip()) == 1 and name != 'site':
+            top_level.append((imports[name], name))
+    return wall_ms, imports, sorted(top_level, reverse=True)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    over_budget = False
+
+    for label, args in SCENARIOS:
+        samples = [run(args) for _ in range(runs)]
+        wall_ms = statistics.median(sample[0] for sample in samples)
+        imports, top_level = samples[-1][1], samples[-1][2]
+        print(f"{label:<18} median wall {wall_ms:7.1f} ms")
+        if top_level:
+            print("    top-level imports: " + ", ".join(f"{name} {ms:.1f} ms" for ms, name in top_level[:4]))
+
+        for module, budget in BUDGETS_MS.items():
+            if module in imports:
+                status = "ok" if imports[module] <= budget else "OVER BUDGET"
+                over_budget = over_budget or imports[module] > budget
+                print(f"    {module}: {imports[module]:.1f} ms (budget {budget} ms) {status}")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Table benchmark: layout and render time of markdown pipe tables by row count
+
+Builds tables of increasing length and prints the time per row, which should
+stay flat as tables grow. For comparison, the same cells are laid out in a
+LongTable with ReportLab's automatic column sizing (colWidths=None).
+
+Usage (from proposal_generator/):
+    python benchmarks/table_benchmark.py [max_rows]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.platypus import LongTable, Paragraph
+
+from hhn_pdf_generator.core.styles import StyleManager
+from hhn_pdf_generator.core.template import PageTrackingDocTemplate
+from hhn_pdf_generator.utils.markdown_parser import MarkdownParser
+
+
+def table(rows):
+    """Markdown with one results table of the given number of rows"""
+    lines = [
+        "| Run | Dataset | Accuracy | Latency (ms) | Notes |",
+        "|-----|---------|---------:|-------------:|-------|",
+    ]
+    for i in range(rows):
+        note = "baseline" if i % 3 else f"**tuned** with `lr={i / 1000:.3f}` and a note long enough to wrap in its cell"
+        lines.append(f"| {i} | set-{i % 7} | {0.5 + (i % 500) / 1000:.3f} | {10 + i % 90} | {note} |")
+    return "Results:\n\n" + "\n".join(lines) + "\n"
+
+
+def build(story_builder, layout_only):
+    """Create the story and build it into a fresh document; returns (seconds, pages)"""
+    doc = PageTrackingDocTemplate(layout_only=layout_only)
+    start = time.perf_counter()
+    doc.build(story_builder())
+    return time.perf_counter() - start, doc.page
+
+
+def auto_sized(blocks, styles):
+    """The table as a LongTable of paragraphs sized entirely by ReportLab"""
+    table = blocks[1]
+    data = [
+        [Paragraph(markup, styles['TableHeader' if index == 0 else 'TableCell']) for markup in row]
+        for index, row in enumerate([table.header] + table.rows)
+    ]
+    return [blocks[0].create_paragraph(styles), LongTable(data, repeatRows=1)]
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    styles = StyleManager().get_styles()
+
+    rows = 250
+    print(f"{'rows':>6} {'pages':>6} {'layout':>10} {'render':>10} {'per row':>10} {'auto widths':>12}")
+    while rows <= max_rows:
+        parser = MarkdownParser()
+        blocks = parser.parse_blocks(table(rows))
+        layout, pages = build(lambda: parser.create_flowables(blocks, styles), layout_only=True)
+        render, _ = build(lambda: parser.create_flowables(blocks, styles), layout_only=False)
+
+        # Same cells, sized by ReportLab; quadratic, so only for smaller tables
+        auto = ''
+        if rows <= 1000:
+            auto = f"{build(lambda: auto_sized(blocks, styles), layout_only=True)[0]*1000:9.1f} ms"
+
+        print(f"{rows:6d} {pages:6d} {layout*1000:8.1f} ms {render*1000:8.1f} ms "
+              f"{render/rows*1e6:7.1f} µs {auto:>12}")
+        rows *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Worker pool benchmark: batch throughput of a mixed workload under limits
+
+Converts a batch of short proposals, two long documents and one runaway
+document (a very long code listing standing in for a document that makes
+a worker spin) without limits, with a job timeout, and with a timeout plus
+recycling after every job (the worst case of --max-jobs-per-worker).
+
+Usage (from proposal_generator/):
+    python benchmarks/worker_pool_benchmark.py [short documents]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hhn_pdf_generator.core.batch import generate_many
+
+SAMPLE = os.path.join(ROOT, 'proposal_english.md')
+TIMEOUT = 3.0
+
+
+def create_inputs(directory, count):
+    """Short proposals, two 20 page documents and a runaway listing"""
+    with open(SAMPLE, 'r', encoding='utf-8') as f:
+        text = f.read()
+    section = "\n\n## Additional Section\n\n" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40 + "\n"
+    listing = "\n\n```python\n" + "\n".join(f"value_{i} = compute({i}, 'argument')" for i in range(40000)) + "\n```\n"
+
+    documents = {f'short_{i:02d}.md': text for i in range(count)}
+    documents['long_1.md'] = text + section * 22
+    documents['long_2.md'] = text + section * 22
+    documents['runaway.md'] = text + listing
+
+    inputs = []
+    for name, content in documents.items():
+        path = os.path.join(directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        inputs.append(path)
+    return inputs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    settings = [
+        ('no limits', {'job_timeout': 0, 'max_rss_mb': 0, 'max_jobs_per_worker': 0}),
+        (f'timeout {TIMEOUT:g}s', {'job_timeout': TIMEOUT}),
+        ('timeout + recycle', {'job_timeout': TIMEOUT, 'max_jobs_per_worker': 1}),
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = create_inputs(directory, count)
+        print(f"{len(inputs)} documents ({count} short, 2 long, 1 runaway), {os.cpu_count()} CPU(s), output cache off")
+        for label, limits in settings:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(open(os.devnull, 'w')):
+                results = generate_many(inputs, output_dir=os.path.join(directory, 'out'), use_cache=False, **limits)
+            seconds = time.perf_counter() - start
+            killed = [os.path.basename(result['input']) for result in results if result['killed']]
+            print(f"  {label:<18} {seconds:7.2f}s wall, killed: {', '.join(killed) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -88,13 +88,9 @@ echo.
 echo Starting conversion...
 echo.
 
-for %%f in (*.md) do (
-    if /i not "%%f"=="README.md" (
-        echo Converting: %%f
-        python -m hhn_pdf_generator.main "%%f"
-        echo.
-    )
-)
+REM One batch run: logos are downloaded once and files convert in parallel
+python -m hhn_pdf_generator.main .
+echo.
 
 echo ================================================================
 echo Conversion completed
@@ -6,6 +6,31 @@ Universal Heilbronn University Markdown to PDF Converter
 __version__ = "2.0.0"
 __author__ = "HHN UniTyLab"
 
-from .core.generator import UniversalMarkdownToPDF
+__all__ = ["UniversalMarkdownToPDF", "generate_pdf_bytes", "generate_many", "render", "DocumentSpec", "RenderResult", "render_pdf_async", "MetricsCollector", "RenderProfiler"]
 
-__all__ = ["UniversalMarkdownToPDF"]
\ No newline at end of file
+# Public names are imported on first access so that e.g. `main.py --help`
+# doesn't load reportlab, PIL, yaml and requests
+_LAZY_EXPORTS = {
+    "UniversalMarkdownToPDF": ".core.generator",
+    "generate_pdf_bytes": ".core.generator",
+    "generate_many": ".core.batch",
+    "render": ".core.render",
+    "DocumentSpec": ".core.render",
+    "RenderResult": ".core.render",
+    "render_pdf_async": ".core.async_render",
+    "MetricsCollector": ".core.metrics",
+    "RenderProfiler": ".core.profiling",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+asyncio API of HHN PDF Generator
+"""
+
+import os
+import atexit
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import Config
+from .render import DocumentSpec, render
+from ..utils.logo_handler import LogoHandler
+
+
+def _render_bytes(spec):
+    """Executor job: render a DocumentSpec into PDF bytes (picklable for process pools)"""
+    return render(spec).pdf_bytes
+
+
+class AsyncRenderer:
+    """Renders documents for an asyncio event loop without blocking it
+
+    Parsing and the ReportLab build run in executor, by default a thread
+    pool of max_jobs threads (the render core is reentrant); pass a
+    ProcessPoolExecutor to build on several cores. At most max_jobs
+    documents build at once, further jobs wait for a slot. The logos are
+    fetched once, in a thread, and shared by all jobs. Use one renderer
+    per event loop.
+    """
+
+    def __init__(self, executor=None, max_jobs=None, timeout=None):
+        self.max_jobs = max_jobs or Config.ASYNC_MAX_JOBS or os.cpu_count() or 1
+        self.timeout = timeout if timeout is not None else Config.ASYNC_JOB_TIMEOUT
+        self.owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(self.max_jobs, thread_name_prefix='hhn_render')
+        self.semaphore = asyncio.Semaphore(self.max_jobs)
+        self.logo_handler = LogoHandler()
+        self._logos = None  # Future of the logo download, shared by all jobs
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    async def render(self, markdown_text, front_matter=None, base_dir=None, use_cache=True, timeout=None):
+        """Render a document and return the PDF bytes
+
+        Arguments are those of DocumentSpec. Raises asyncio.TimeoutError if
+        the job, waiting for a slot included, takes longer than timeout
+        seconds (default: the renderer's timeout, None: no limit). A build
+        that already started can't be interrupted: after a timeout or
+        cancellation its slot is only freed once it has finished.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        return await asyncio.wait_for(self._render(markdown_text, front_matter, base_dir, use_cache), timeout)
+
+    async def _render(self, markdown_text, front_matter, base_dir, use_cache):
+        hhn_logo_path, unitylab_logo_path = await self._logo_paths()
+        spec = DocumentSpec(
+            markdown_text,
+            front_matter,
+            base_dir,
+            hhn_logo_path,
+            unitylab_logo_path,
+            use_cache=use_cache
+        )
+
+        await self.semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            job = self.executor.submit(_render_bytes, spec)
+        except BaseException:
+            self.semaphore.release()
+            raise
+        job.add_done_callback(lambda _: self._release_slot(loop))
+
+        # Cancelling the wrapper also cancels a job still queued in the executor
+        return await asyncio.wrap_future(job)
+
+    def _release_slot(self, loop):
+        """Free a slot once its build has ended (called from the executor)"""
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self.semaphore.release)
+
+    async def _logo_paths(self):
+        if self._logos is None:
+            self._logos = asyncio.ensure_future(asyncio.to_thread(self.logo_handler.download_logos))
+        # Shielded: cancelling one job must not cancel the download other jobs wait for
+        await asyncio.shield(self._logos)
+        return self.logo_handler.hhn_logo_path, self.logo_handler.unitylab_logo_path
+
+    def close(self):
+        """Stop an executor created by the renderer and clean up the logos"""
+        if self.owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.logo_handler.cleanup_logos()
+
+
+# Renderers of render_pdf_async() calls without a renderer, one per event
+# loop (a renderer's semaphore and logo download belong to one loop)
+_default_renderers = {}
+_default_renderers_lock = threading.Lock()
+
+
+def _default_renderer(loop):
+    """The default renderer of loop; renderers of closed loops are closed"""
+    with _default_renderers_lock:
+        closed = [other for other in _default_renderers if other.is_closed()]
+        stale = [_default_renderers.pop(other) for other in closed]
+        renderer = _default_renderers.get(loop)
+        if renderer is None:
+            renderer = _default_renderers[loop] = AsyncRenderer()
+    for other in stale:
+        other.close()
+    return renderer
+
+
+def close_default_renderers():
+    """Stop the thread pools of all default renderers and clean up their logos
+
+    Called at exit; call it earlier to free the threads of render_pdf_async.
+    """
+    with _default_renderers_lock:
+        renderers = list(_default_renderers.values())
+        _default_renderers.clear()
+    for renderer in renderers:
+        renderer.close()
+
+
+atexit.register(close_default_renderers)
+
+
+async def render_pdf_async(markdown_text, front_matter=None, base_dir=None, *,
+                           use_cache=True, timeout=None, renderer=None):
+    """Render markdown into PDF bytes without blocking the event loop
+
+    Runs on renderer, or on the default AsyncRenderer of the running event
+    loop (thread pool, Config.ASYNC_MAX_JOBS jobs at once), so every
+    asyncio.run() gets its own. See AsyncRenderer.render and
+    close_default_renderers.
+    """
+    if renderer is None:
+        renderer = _default_renderer(asyncio.get_running_loop())
+    return await renderer.render(markdown_text, front_matter, base_dir, use_cache, timeout)
@@ -0,0 +1,257 @@
+"""
+Parallel batch conversion for HHN PDF Generator
+"""
+
+import os
+import io
+import glob
+import time
+import contextlib
+from concurrent.futures import Future
+
+from ..core.generator import UniversalMarkdownToPDF, default_output_dir
+from ..core.styles import StyleManager
+from ..core.config import Config
+from ..core.worker_pool import WorkerPool, JobKilledError
+from ..core.metrics import MetricsCollector
+from ..core.profiling import RenderProfiler
+from ..utils.logo_handler import LogoHandler
+from ..utils.console import set_quiet
+
+
+# Per-process state of a warm batch worker
+_worker_logo_handler = None
+_worker_style_manager = None
+
+
+def collect_inputs(patterns):
+    """Expand files, directories and glob patterns into markdown input files
+
+    Directories contribute all *.md files except README.md (like convert_all.bat).
+    """
+    inputs = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [
+                path for path in sorted(glob.glob(os.path.join(pattern, '*.md')))
+                if os.path.basename(path).lower() != 'readme.md'
+            ]
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+        else:
+            matches = [pattern]
+
+        for path in matches:
+            if path not in inputs:
+                inputs.append(path)
+    return inputs
+
+
+def _init_worker(hhn_logo_path, unitylab_logo_path, profile=None, quiet=False):
+    """Keep logos and stylesheet warm for all jobs of this worker process"""
+    global _worker_logo_handler, _worker_style_manager
+    if quiet:
+        set_quiet()
+    if profile:
+        Config.apply_profile(profile)
+    _worker_logo_handler = LogoHandler(hhn_logo_path, unitylab_logo_path)
+    _worker_style_manager = StyleManager()
+
+
+def _convert_one(input_file, output_file, use_cache=True, cpu_profile_file=None, profile_memory=False):
+    """Convert a single file in a worker and return its result record
+
+    With cpu_profile_file or profile_memory the conversion runs under a
+    RenderProfiler; result['memory'] holds its memory report.
+    """
+    result = {
+        'input': input_file, 'output': output_file, 'seconds': 0.0,
+        'passes': 0, 'cached': False, 'error': None, 'killed': None, 'metrics': None, 'memory': None
+    }
+    start = time.perf_counter()
+    metrics = MetricsCollector()
+    profiler = RenderProfiler(cpu_profile_file, profile_memory) if cpu_profile_file or profile_memory else None
+    try:
+        converter = UniversalMarkdownToPDF(
+            input_file,
+            logo_handler=_worker_logo_handler,
+            style_manager=_worker_style_manager
+        )
+        # Per-document progress output would interleave between workers
+        with contextlib.redirect_stdout(io.StringIO()):
+            with profiler.capture(metrics) if profiler else contextlib.nullcontext():
+                result['output'] = converter.generate_pdf(input_file, output_file, use_cache=use_cache, metrics=metrics)
+        result['passes'] = converter.layout_passes
+        result['cached'] = converter.layout_passes == 0
+    except Exception as e:
+        result['error'] = str(e)
+    result['metrics'] = metrics.report()  # Partial for failed documents
+    if profiler is not None:
+        result['memory'] = profiler.memory_report()
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def generate_many(inputs, jobs=None, output_dir=None, use_cache=True, profile=None,
+                  job_timeout=None, max_rss_mb=None, max_jobs_per_worker=None,
+                  cpu_profile_dir=None, profile_memory=False):
+    """Convert many markdown files in parallel and return one result dict per file
+
+    Logos are downloaded once and shared by all workers; each worker process
+    reuses its logos and stylesheet for every document it converts. Unchanged
+    documents are taken from the output cache unless use_cache is False.
+    profile names an entry of Config.OUTPUT_PROFILES applied in every worker.
+    PDFs are written to output_dir (default: the Output directory) as
+    HHN_<name>.pdf; files of the same name from different directories keep
+    their relative directories there instead of overwriting each other.
+
+    Workers run under the limits of a WorkerPool (defaults: Config.WORKER_*,
+    0 disables a limit): a document over job_timeout seconds or max_rss_mb
+    MB of memory is killed and reported with result['killed'] set to the
+    reason, and workers are replaced after max_jobs_per_worker documents.
+    Large files are started first so that no long job is left for the end.
+    With jobs=1 and all limits disabled everything runs in the current
+    process.
+
+    Every document can be profiled on its own: with cpu_profile_dir its
+    cProfile stats are written to <cpu_profile_dir>/<name>.pstats, with
+    profile_memory result['memory'] holds its RenderProfiler memory report.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    outputs = _target_paths(inputs, output_dir or default_output_dir(), lambda stem: f"HHN_{stem}.pdf")
+    cpu_profile_files = (
+        _target_paths(inputs, cpu_profile_dir, lambda stem: f"{stem}.pstats")
+        if cpu_profile_dir else [None] * len(inputs)
+    )
+    for path in outputs:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    logo_handler = LogoHandler()
+    logo_handler.download_logos()
+    worker_args = (logo_handler.hhn_logo_path, logo_handler.unitylab_logo_path, profile)
+
+    try:
+        if jobs == 1 and job_timeout == 0 and max_rss_mb == 0 and max_jobs_per_worker == 0:
+            _init_worker(*worker_args)
+            return [
+                _convert_one(i, o, use_cache, c, profile_memory)
+                for i, o, c in zip(inputs, outputs, cpu_profile_files)
+            ]
+
+        with WorkerPool(
+            min(jobs, len(inputs)) or 1,
+            _init_worker,
+            worker_args + (True,),  # Worker output is discarded, skip formatting it
+            job_timeout=job_timeout,
+            max_rss_mb=max_rss_mb,
+            max_jobs_per_worker=max_jobs_per_worker
+        ) as pool:
+            # Longest first (by file size) keeps a late large document from
+            # running alone while the other workers are idle
+            order = sorted(range(len(inputs)), key=lambda index: -_file_size(inputs[index]))
+            futures = {}
+            for index in order:
+                try:
+                    futures[index] = pool.submit(
+                        _convert_one, inputs[index], outputs[index], use_cache, cpu_profile_files[index], profile_memory
+                    )
+                except RuntimeError as e:
+                    # Workers failed to start; recorded like any other failure
+                    futures[index] = Future()
+                    futures[index].set_exception(e)
+            results = []
+            for index, (input_file, output_file) in enumerate(zip(inputs, outputs)):
+                try:
+                    results.append(futures[index].result())
+                except JobKilledError as e:
+                    results.append(_failed_result(input_file, output_file, str(e), e.seconds, e.reason))
+                except Exception as e:
+                    # The pool itself failed, e.g. it was shut down or workers can't start
+                    results.append(_failed_result(input_file, output_file, f"{type(e).__name__}: {e}"))
+            return results
+    finally:
+        logo_handler.cleanup_logos()
+
+
+def _target_paths(inputs, directory, name):
+    """Path in directory for every input file, with name(stem) as file name
+
+    If inputs from different directories share a file name (a/x.md and
+    b/x.md), every input is placed below its directory relative to the
+    common directory of all inputs instead. Raises ValueError if two inputs
+    still map to the same path (the same file given twice).
+    """
+    def targets(mirror):
+        paths = []
+        for input_file in inputs:
+            stem = os.path.splitext(os.path.basename(input_file))[0]
+            relative = os.path.relpath(os.path.dirname(os.path.abspath(input_file)), common) if mirror else ''
+            paths.append(os.path.normpath(os.path.join(directory, relative, name(stem))))
+        return paths
+
+    def duplicates(paths):
+        seen = {}
+        for input_file, path in zip(inputs, paths):
+            seen.setdefault(os.path.normcase(path), []).append(input_file)
+        return [files for files in seen.values() if len(files) > 1]
+
+    paths = targets(mirror=False)
+    if duplicates(paths):
+        common = os.path.commonpath([os.path.dirname(os.path.abspath(input_file)) for input_file in inputs])
+        paths = targets(mirror=True)
+        clashes = duplicates(paths)
+        if clashes:
+            raise ValueError("Input files given more than once: " + "; ".join(" = ".join(files) for files in clashes))
+    return paths
+
+
+def _failed_result(input_file, output_file, error, seconds=0.0, killed=None):
+    return {
+        'input': input_file, 'output': output_file, 'seconds': seconds,
+        'passes': 0, 'cached': False, 'error': error, 'killed': killed, 'metrics': None, 'memory': None
+    }
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def print_batch_summary(results, wall_seconds=None):
+    """Print a per-file timing summary of a batch run"""
+    print("📊 Batch summary:")
+    for result in results:
+        name = os.path.basename(result['input'])
+        if result['error']:
+            print(f"   ❌ {name:<40} {result['seconds']:7.2f}s  {result['error']}")
+        elif result['cached']:
+            print(f"   ♻️ {name:<40} {result['seconds']:7.2f}s  cache hit")
+        else:
+            print(f"   ✅ {name:<40} {result['seconds']:7.2f}s  {result['passes']} pass(es)")
+
+    failed = sum(1 for result in results if result['error'])
+    killed = sum(1 for result in results if result.get('killed'))
+    total = sum(result['seconds'] for result in results)
+    failures = f"{failed} failed ({killed} killed)" if killed else f"{failed} failed"
+    print(f"   • {len(results) - failed} converted, {failures}, {total:.2f}s summed job time")
+    if wall_seconds is not None:
+        print(f"   • Wall time: {wall_seconds:.2f}s")
+
+
+def batch_metrics_report(results, wall_seconds):
+    """JSON-ready metrics of a batch run: wall time and the report of every document"""
+    return {
+        'total': {'wall_ms': round(wall_seconds * 1000, 2)},
+        'documents': [
+            {
+                'input': result['input'],
+                'output': result['output'],
+                'error': result['error'],
+                'killed': result['killed'],
+                **(result['metrics'] or {}),
+            }
+            for result in results
+        ],
+    }
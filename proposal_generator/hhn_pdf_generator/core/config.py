@@ -2,15 +2,134 @@
 Configuration and constants for HHN PDF Generator
 """
 
+import os
 from reportlab.lib.colors import Color
 
 class Config:
     """Configuration class for HHN PDF Generator"""
     
+    # Settings that change the rendered PDF must be listed in
+    # utils.output_cache.KEY_SETTINGS so that cached PDFs are invalidated
+    
     # Logo URLs
     HHN_LOGO_URL = "https://cdn.hs-heilbronn.de/047cbc98bf14b729/7113c7508128/v/4c6377dc113e/HHN_Logo_E_oS_RGB_300_jpg.jpg?nowebp=1"
     UNITYLAB_LOGO_URL = "https://cdn.hs-heilbronn.de/8d41ec60cab88cb6/5ee0c1617b9e/v/95877e4a7a51/8d41ec60cab88cb6-1cdc02db2ba3-UniTyLab_Logo.png"
     
+    # Local logo files used when the logos can't be downloaded and aren't cached
+    HHN_LOGO_PATH = os.environ.get('HHN_LOGO_PATH')
+    UNITYLAB_LOGO_PATH = os.environ.get('UNITYLAB_LOGO_PATH')
+    
+    # Persistent logo cache (revalidated at most once per TTL seconds)
+    LOGO_CACHE_DIR = os.environ.get('HHN_LOGO_CACHE_DIR') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'hhn_pdf_generator', 'logos'
+    )
+    LOGO_CACHE_TTL = 24 * 60 * 60
+    LOGO_DOWNLOAD_TIMEOUT = 10
+    
+    # Content-addressed cache of rendered PDFs
+    OUTPUT_CACHE_DIR = os.environ.get('HHN_OUTPUT_CACHE_DIR') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'hhn_pdf_generator', 'pdf'
+    )
+    
+    # Persistent cache of syntax highlighting tokens of code blocks
+    TOKEN_CACHE_DIR = os.environ.get('HHN_TOKEN_CACHE_DIR') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'hhn_pdf_generator', 'tokens'
+    )
+    
+    # Downscaled copies of embedded images, keyed by source hash and target size
+    IMAGE_CACHE_DIR = os.environ.get('HHN_IMAGE_CACHE_DIR') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'hhn_pdf_generator', 'images'
+    )
+    
+    # Output settings (overridden by the --profile entries of OUTPUT_PROFILES):
+    # page stream compression, ASCII85 encoding of binary streams (ReportLab's
+    # default; 25% larger and slow to write), resolution images are downscaled
+    # to at their display size, quality of recompressed JPEGs, format of
+    # recompressed images (None: JPEG sources as JPEG, others as PNG; 'JPEG':
+    # all images without transparency as JPEG) and whether images are drawn by
+    # file so that content-identical files are embedded once
+    OUTPUT_PROFILE = None
+    PDF_PAGE_COMPRESSION = True
+    PDF_ASCII85 = True
+    IMAGE_DPI = 200
+    IMAGE_JPEG_QUALITY = 85
+    IMAGE_FORMAT = None
+    IMAGE_REUSE = False
+    
+    OUTPUT_PROFILES = {
+        # Drafts: nothing is compressed twice, images are passed through as JPEG
+        'fast': {
+            'PDF_PAGE_COMPRESSION': False,
+            'PDF_ASCII85': False,
+            'IMAGE_DPI': 150,
+            'IMAGE_JPEG_QUALITY': 80,
+            'IMAGE_FORMAT': 'JPEG',
+            'IMAGE_REUSE': True,
+        },
+        # Sharing by mail: screen resolution and stronger JPEG compression
+        'small': {
+            'PDF_PAGE_COMPRESSION': True,
+            'PDF_ASCII85': False,
+            'IMAGE_DPI': 150,
+            'IMAGE_JPEG_QUALITY': 70,
+            'IMAGE_FORMAT': 'JPEG',
+            'IMAGE_REUSE': True,
+        },
+        # Printing and archiving: print resolution, lossless screenshots
+        'archive': {
+            'PDF_PAGE_COMPRESSION': True,
+            'PDF_ASCII85': False,
+            'IMAGE_DPI': 300,
+            'IMAGE_JPEG_QUALITY': 95,
+            'IMAGE_FORMAT': None,
+            'IMAGE_REUSE': True,
+        },
+    }
+    
+    # Code block colors by Pygments token type (the most specific listed type wins)
+    CODE_TOKEN_COLORS = {
+        'Keyword': Color(0.0, 0.2, 0.7),
+        'Operator.Word': Color(0.0, 0.2, 0.7),
+        'Name.Builtin': Color(0.0, 0.2, 0.7),
+        'Name.Function': Color(0.0, 0.38, 0.48),
+        'Name.Class': Color(0.0, 0.38, 0.48),
+        'Name.Decorator': Color(0.6, 0.45, 0.0),
+        'Name.Tag': Color(0.0, 0.2, 0.7),
+        'Name.Attribute': Color(0.6, 0.2, 0.0),
+        'Literal.String': Color(0.02, 0.49, 0.09),
+        'Literal.Number': Color(0.09, 0.31, 0.92),
+        'Comment': Color(0.5, 0.5, 0.5),
+    }
+    
+    # Upper bound for layout passes until TOC page numbers converge
+    MAX_LAYOUT_PASSES = 4
+    
+    # Seconds between checks of the input file in watch mode
+    WATCH_POLL_INTERVAL = 0.5
+    
+    # Render server (python -m hhn_pdf_generator.server): listen address,
+    # largest accepted request and number of recent renders in the latency
+    # percentiles of /metrics
+    SERVER_HOST = '127.0.0.1'
+    SERVER_PORT = 8765
+    SERVER_MAX_REQUEST_BYTES = 10 * 1024 * 1024
+    SERVER_LATENCY_WINDOW = 1000
+    
+    # asyncio API (render_pdf_async): documents built at once (None: CPU count)
+    # and seconds until a job times out (None: no limit)
+    ASYNC_MAX_JOBS = None
+    ASYNC_JOB_TIMEOUT = None
+    
+    # Worker processes of batch mode and the render server: seconds a job may
+    # run, resident memory (MB) a worker may use while running it and jobs
+    # after which a worker is replaced by a fresh process (None: no limit).
+    # A job over a limit is killed together with its worker; limits are
+    # checked every WORKER_POLL_INTERVAL seconds.
+    WORKER_JOB_TIMEOUT = 300
+    WORKER_MAX_RSS_MB = 2048
+    WORKER_MAX_JOBS = 200
+    WORKER_POLL_INTERVAL = 0.05
+    
     # Color scheme
     COLORS = {
         'primary': Color(0.0, 0.2, 0.4),      # HHN Dark blue
@@ -44,4 +163,11 @@ class Config:
     OPTIONAL_UNI_FIELDS = ['department']
     
     # New flags section fields
-    OPTIONAL_FLAGS_FIELDS = ['toc_on_table_page', 'signature_line', 'supervisor_signature', 'co_supervisor_signature']
\ No newline at end of file
+    OPTIONAL_FLAGS_FIELDS = ['toc_on_table_page', 'signature_line', 'supervisor_signature', 'co_supervisor_signature']
+    
+    @classmethod
+    def apply_profile(cls, name):
+        """Override the output settings with the named entry of OUTPUT_PROFILES"""
+        for setting, value in cls.OUTPUT_PROFILES[name].items():
+            setattr(cls, setting, value)
+        cls.OUTPUT_PROFILE = name
@@ -3,347 +3,219 @@ Main PDF generator class
 """
 
 import os
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.platypus import Spacer, PageBreak
+import time
+import dataclasses
 
-from ..core.template import PageTrackingDocTemplate
+from ..core.render import DocumentSpec, load_document, render_document
 from ..core.styles import StyleManager
 from ..core.config import Config
+from ..core.metrics import MetricsCollector
 from ..utils.logo_handler import LogoHandler
-from ..utils.yaml_parser import YAMLParser
-from ..utils.markdown_parser import MarkdownParser
-from ..generators.title_page import TitlePageGenerator
-from ..generators.toc import TOCGenerator
-from ..generators.signature import SignatureLineGenerator
+from ..utils.output_cache import OutputCache
+from ..utils.file_utils import read_lines, write_file_atomic, format_size
+from ..utils.console import get_logger
 
+logger = get_logger(__name__)
 
-class UniversalMarkdownToPDF:
-    """Universal converter for any markdown file to professional HHN PDF"""
-
-    def __init__(self, markdown_file=None):
-        self.markdown_file = markdown_file
 
-        # Initialize components
-        self.logo_handler = LogoHandler()
-        self.yaml_parser = YAMLParser()
-        self.markdown_parser = MarkdownParser()
-        self.style_manager = StyleManager()
-
-        # Colors from config
-        self.colors = Config.COLORS
+class UniversalMarkdownToPDF:
+    """Universal converter for any markdown file to professional HHN PDF
 
-    def create_header_footer(self, canvas, doc):
-        """Create professional header and footer with logos and page numbers"""
-        canvas.saveState()
+    A session around the reentrant core in core.render: it holds the logos
+    and stylesheet shared by its documents and remembers the page numbers
+    of each input file as the first guess for its next build. Per-document
+    state only lives in the immutable JobContext of each render, so nothing
+    of one document leaks into the next. One instance serves one thread at
+    a time; concurrent renders call core.render.render() directly.
+    """
 
-        page_num = canvas.getPageNumber()
+    def __init__(self, markdown_file=None, logo_handler=None, style_manager=None):
+        self.markdown_file = markdown_file
 
-        # Skip header/footer on title page (page 1)
-        if page_num == 1:
-            canvas.restoreState()
-            return
+        # Initialize components; a shared logo handler (e.g. in a batch worker)
+        # already holds the logos and is neither downloaded nor cleaned up here
+        self.owns_logos = logo_handler is None
+        self.logo_handler = logo_handler or LogoHandler()
+        self.style_manager = style_manager or StyleManager()
+        self.output_cache = OutputCache()
 
-        # Calculate effective page number (TOC pages don't count as content pages)
-        # If TOC is on title page: page 2+ becomes content page 1+
-        # If TOC is on separate page: page 3+ becomes content page 1+
-        toc_on_table_page = self.yaml_parser.document_info.get('toc_on_table_page', False)
-        if toc_on_table_page:
-            content_page_num = page_num - 1  # Page 2 becomes page 1
-        else:
-            content_page_num = page_num - 2  # Page 3 becomes page 1
-
-        # Only show page numbers on content pages (not on TOC-only pages)
-        show_page_number = content_page_num > 0
-
-        # Footer with university info and logos
-        canvas.setFont('Helvetica', 8)
-        canvas.setFillColor(self.colors['secondary'])
-
-        # HHN logo (left side of footer)
-        if self.logo_handler.hhn_logo_path:
-            try:
-                canvas.drawImage(self.logo_handler.hhn_logo_path, 2*cm, 0.5*cm,
-                               width=2.5*cm, height=0.8*cm, preserveAspectRatio=True)
-                # University info next to HHN logo (left side)
-                canvas.setFont('Helvetica', 7)
-                canvas.drawString(5*cm, 1.0*cm, self.yaml_parser.university_info['name'])
-                canvas.drawString(5*cm, 0.7*cm, self.yaml_parser.university_info['subtitle'])
-            except Exception as e:
-                print(f"Warning: Could not add HHN logo to footer: {e}")
-        else:
-            # University info fallback (left side)
-            canvas.setFont('Helvetica', 7)
-            canvas.drawString(2*cm, 1.0*cm, self.yaml_parser.university_info['name'])
-            canvas.drawString(2*cm, 0.7*cm, self.yaml_parser.university_info['subtitle'])
-
-        # UniTyLab logo (right side of footer)
-        if self.logo_handler.unitylab_logo_path:
-            try:
-                canvas.drawImage(self.logo_handler.unitylab_logo_path, A4[0]-4.5*cm, 0.5*cm,
-                               width=2.5*cm, height=0.8*cm, preserveAspectRatio=True)
-            except Exception as e:
-                print(f"Warning: Could not add UniTyLab logo to footer: {e}")
-        else:
-            # UniTyLab text fallback (right side)
-            canvas.setFont('Helvetica', 7)
-            canvas.drawRightString(A4[0]-2*cm, 1.0*cm, "UniTyLab")
-            canvas.drawRightString(A4[0]-2*cm, 0.7*cm, "University Technology Lab")
+        # Parsed sections to reuse between builds (see MarkdownParser.scan_lines), None: off
+        self.section_cache = None
 
-        # Add page number in center of footer (only for content pages)
-        if show_page_number:
-            canvas.setFont('Helvetica', 9)
-            canvas.setFillColor(self.colors['primary'])
-            canvas.drawCentredString(A4[0]/2, 0.8*cm, f"Page {content_page_num}")
+        # Heading anchors and converged TOC page numbers per input file, reused as first guess
+        self.page_hints = {}
+        self.layout_passes = 0
+        self.metrics = None  # MetricsCollector of the last document
 
-        canvas.restoreState()
+    def generate_pdf(self, input_file, output_file=None, use_cache=True, output=None, metrics=None):
+        """Generate PDF from markdown file
+        
+        With use_cache, an unchanged document is taken from the output cache
+        instead of being rendered again. With output, a writable binary file
+        object (e.g. BytesIO or an HTTP response), the PDF is written there
+        and returned instead of a path; no Output directory or file is created.
+        Phase times and counters are collected in metrics (default: a new
+        MetricsCollector), available as self.metrics afterwards.
+        """
+        self.metrics = metrics = metrics or MetricsCollector()
+
+        if output is None:
+            output_file = self._output_path(input_file, output_file)
 
-    def generate_pdf(self, input_file, output_file=None):
-        """Generate PDF from markdown file"""
+        # Read input file
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"Input file not found: {input_file}")
 
+        # The lines are streamed through parsing and hashing in one scan;
+        # the file is never held as one string
+        logger.info(f"📖 Reading markdown file: {input_file}")
+        input_path = os.path.abspath(input_file)
+        pdf_bytes, context = self._render(
+            read_lines(input_file), None, os.path.dirname(input_path), input_path, use_cache, output_file
+        )
+        with metrics.phase('write'):
+            if output is not None:
+                output.write(pdf_bytes)
+            elif pdf_bytes is not None:
+                write_file_atomic(output_file, pdf_bytes)
+        metrics.stop()
+        if output is None and pdf_bytes is not None:
+            logger.info(f"✅ PDF successfully generated: {output_file}")
+
+        if self.layout_passes:
+            logger.info("")
+            self._print_document_structure(context)
+        if output is not None:
+            logger.info("🎉 SUCCESS! Your document is ready")
+            return output
+        logger.info(f"🎉 SUCCESS! Your document is ready at: {output_file}")
+        return output_file
+
+    def generate_pdf_bytes(self, markdown_text, front_matter=None, base_dir=None, use_cache=True, metrics=None):
+        """Generate a PDF from markdown text and return its bytes
+        
+        front_matter is a dict or YAML text; without it markdown_text has to
+        start with its own YAML front matter. Relative image paths are
+        resolved against base_dir (default: the working directory). Nothing
+        is written to disk apart from the logo, image and output caches.
+        Metrics are collected like in generate_pdf.
+        """
+        self.metrics = metrics or MetricsCollector()
+        pdf_bytes, context = self._render(markdown_text, front_matter, base_dir, None, use_cache)
+        self.metrics.stop()
+        if self.layout_passes:
+            self._print_document_structure(context)
+        return pdf_bytes
+
+    def _output_path(self, input_file, output_file):
+        """Path of the output file; bare file names go into the Output directory"""
         # Determine output filename and ensure Output directory exists
         if not output_file:
             base_name = os.path.splitext(os.path.basename(input_file))[0]
             output_file = f"HHN_{base_name}.pdf"
 
+        # If output_file has a path, use it as-is (user specified full path)
+        if os.path.dirname(output_file):
+            return output_file
+
         # Create Output directory if it doesn't exist
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(script_dir))
-        output_dir = os.path.join(project_root, "Output")
+        output_dir = default_output_dir()
 
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
-            print(f"📁 Created Output directory: {output_dir}")
-
-        # If output_file is just a filename (no path), put it in Output directory
-        if not os.path.dirname(output_file):
-            output_file = os.path.join(output_dir, output_file)
-        # If output_file has a path, use it as-is (user specified full path)
-
-        # Read input file
-        if not os.path.exists(input_file):
-            raise FileNotFoundError(f"Input file not found: {input_file}")
+            logger.info(f"📁 Created Output directory: {output_dir}")
 
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        return os.path.join(output_dir, output_file)
 
-        print(f"📖 Reading markdown file: {input_file}")
-        print("✅ Content loaded successfully")
-
-        # Parse YAML front matter first
-        content = self.yaml_parser.parse_yaml_frontmatter(content)
-
-        # Detect document information from remaining content
-        self.yaml_parser.document_info = self.markdown_parser.detect_document_info(
-            content, self.yaml_parser.document_info
-        )
-        self.markdown_parser.extract_toc_items(content)
-
-        print(f"🔧 Generating PDF: {output_file}")
+    def _render(self, markdown_text, front_matter, base_dir, hint_key, use_cache, output_file=None):
+        """Render a document and return (PDF bytes, JobContext)
+        
+        On an output cache hit with output_file given, the cached PDF is hard
+        linked there and the bytes are None. hint_key identifies the document for
+        the page number hints of later builds (None: no hints).
+        """
+        metrics = self.metrics
 
         # Download logos
-        self.logo_handler.download_logos()
+        if self.owns_logos:
+            with metrics.phase('logos'):
+                self.logo_handler.download_logos()
 
         try:
-            # Two-pass generation for accurate TOC page numbers
-            print("🔨 Building PDF with accurate page numbers (2-pass system)...")
-
-            # First pass: Generate without page numbers in TOC to determine actual page numbers
-            print("  ↳ First pass: Determining page numbers...")
-            temp_output = output_file.replace('.pdf', '_temp.pdf')
-
-            # Create PDF with page tracking template
-            doc = PageTrackingDocTemplate(
-                temp_output,
-                pdf_generator=self,
-                pagesize=A4,
-                rightMargin=2.5*cm,
-                leftMargin=2.5*cm,
-                topMargin=3*cm,
-                bottomMargin=2.5*cm
-            )
-
-            # Create styles
-            styles = self.style_manager.create_styles()
-
-            # Build story for first pass
-            story = self._build_story_first_pass(styles, content, doc)
-
-            # Build first pass
-            doc.build(story)
-
-            # Get tracked page numbers
-            page_tracker = doc.get_page_tracker()
-            print(f"  ↳ Tracked {len(page_tracker)} headings")
-
-            # Second pass: Generate final PDF with correct TOC page numbers
-            print("  ↳ Second pass: Creating final PDF with correct page numbers...")
-
-            # Update TOC generator with actual page numbers
-            toc_generator = TOCGenerator(
-                self.markdown_parser.toc_items,
-                self.yaml_parser.document_info
-            )
-            toc_generator.set_actual_page_numbers(page_tracker)
-
-            # Create final PDF
-            doc_final = PageTrackingDocTemplate(
-                output_file,
-                pdf_generator=self,
-                pagesize=A4,
-                rightMargin=2.5*cm,
-                leftMargin=2.5*cm,
-                topMargin=3*cm,
-                bottomMargin=2.5*cm
-            )
-
-            # Build final story with accurate TOC
-            story_final = self._build_story_final_pass(styles, content, toc_generator)
-
-            # Build final PDF
-            doc_final.build(story_final)
-
-            # Cleanup temp file
-            if os.path.exists(temp_output):
-                os.remove(temp_output)
-
-            print(f"✅ PDF successfully generated: {output_file}")
-            print()
-            self._print_document_structure()
-            print(f"🎉 SUCCESS! Your document is ready at: {output_file}")
+            context = load_document(DocumentSpec(
+                markdown_text,
+                front_matter,
+                base_dir,
+                self.logo_handler.hhn_logo_path,
+                self.logo_handler.unitylab_logo_path,
+                use_cache=use_cache
+            ), self.section_cache, metrics)
+            logger.info("✅ Content loaded successfully")
+            logger.info(f"🔧 Generating PDF: {output_file or 'in memory'}")
+
+            if output_file and context.cache_key:
+                with metrics.phase('output_cache'):
+                    fetched = self.output_cache.fetch(context.cache_key, output_file)
+                if fetched:
+                    self.layout_passes = 0
+                    metrics.count('layout_passes', 0)
+                    metrics.count('output_bytes', os.path.getsize(output_file))
+                    logger.info("♻️ Output cache hit, document unchanged")
+                    return None, context
+
+            # Page numbers of the previous build of this file are the best first guess,
+            # unless headings were added or removed since
+            previous_anchors, page_hints = self.page_hints.get(hint_key, (None, None))
+            if previous_anchors == context.anchors:
+                context = dataclasses.replace(context, page_hints=page_hints)
+
+            build_start = time.perf_counter()
+            result = render_document(context, self.style_manager.get_styles(), metrics)
+            self.layout_passes = result.passes
+            if result.cached:
+                return result.pdf_bytes, context
+
+            if hint_key:
+                self.page_hints[hint_key] = (context.anchors, dict(result.page_numbers))
+            logger.info(f"📦 {format_size(len(result.pdf_bytes))} rendered in {time.perf_counter() - build_start:.2f}s "
+                        f"(profile: {Config.OUTPUT_PROFILE or 'default'})")
+            return result.pdf_bytes, context
 
         finally:
             # Cleanup
-            self.logo_handler.cleanup_logos()
-
-    def _build_story_first_pass(self, styles, content, doc_template):
-        """Build story for first pass (without TOC, only for page tracking)"""
-        story = []
-
-        print("📄 Creating title page...")
-        title_generator = TitlePageGenerator(
-            self.yaml_parser.student_info,
-            self.yaml_parser.document_info,
-            self.yaml_parser.university_info,
-            self.yaml_parser.table_labels,
-            self.logo_handler
-        )
-        story.extend(title_generator.create_title_page(styles))
-
-        # Check if TOC should be on the same page or separate page
-        toc_on_table_page = self.yaml_parser.document_info.get('toc_on_table_page', False)
-
-        # Add appropriate page breaks to match final structure, but NO TOC content
-        if not toc_on_table_page:
-            # If TOC will be on separate page, add page break to match structure
-            story.append(PageBreak())  # Page break after title page (for TOC page)
-            story.append(PageBreak())  # Page break after TOC page (for content)
-        else:
-            # If TOC will be on title page, just add page break after title
-            story.append(PageBreak())  # Page break after title+TOC
-
-        print("📝 Processing markdown content...")
-        content_story = self.markdown_parser.parse_markdown_content(
-            content, styles, self.yaml_parser.document_info, doc_template
-        )
+            if self.owns_logos:
+                self.logo_handler.cleanup_logos()
 
-        # Add the processed content (this is where page tracking happens)
-        story.extend(content_story)
-        
-        # Add signatures (author and supervisors integrated)
-        signature_line_enabled = self.yaml_parser.document_info.get('signature_line', False)
-        supervisor_signature_enabled = self.yaml_parser.document_info.get('supervisor_signature', False)
-        co_supervisor_signature_enabled = self.yaml_parser.document_info.get('co_supervisor_signature', False)
-        
-        if signature_line_enabled or supervisor_signature_enabled or co_supervisor_signature_enabled:
-            signature_generator = SignatureLineGenerator(
-                self.yaml_parser.student_info,
-                self.yaml_parser.document_info,
-                self.colors
-            )
-            signature_story = signature_generator.create_signature_line(styles)
-            story.extend(signature_story)
-
-        return story
-
-    def _build_story_final_pass(self, styles, content, toc_generator):
-        """Build story for final pass (with correct TOC page numbers)"""
-        story = []
-
-        print("📄 Creating title page...")
-        title_generator = TitlePageGenerator(
-            self.yaml_parser.student_info,
-            self.yaml_parser.document_info,
-            self.yaml_parser.university_info,
-            self.yaml_parser.table_labels,
-            self.logo_handler
-        )
-        story.extend(title_generator.create_title_page(styles))
-
-        # Check if TOC should be on the same page or separate page
-        toc_on_table_page = self.yaml_parser.document_info.get('toc_on_table_page', False)
-
-        print("📝 Processing markdown content...")
-        content_story = self.markdown_parser.parse_markdown_content(
-            content, styles, self.yaml_parser.document_info
-        )
-
-        print("📋 Creating table of contents with actual page numbers...")
-        toc = toc_generator.create_table_of_contents(styles, use_actual_pages=True)
-
-        if toc:
-            if toc_on_table_page:
-                # Add TOC on the same page as title page
-                print("  ↳ Adding TOC on title page")
-                story.append(Spacer(1, 1*cm))  # Add some space
-                story.extend(toc)
-                story.append(PageBreak())  # Page break after title+TOC
-            else:
-                # Add TOC on separate page
-                print("  ↳ Adding TOC on separate page")
-                story.append(PageBreak())  # Page break after title page
-                story.extend(toc)
-                story.append(PageBreak())  # Page break after TOC
-        else:
-            story.append(PageBreak())  # Just page break after title if no TOC
-
-        # Add the processed content
-        story.extend(content_story)
-        
-        # Add signatures (author and supervisors integrated)
-        signature_line_enabled = self.yaml_parser.document_info.get('signature_line', False)
-        supervisor_signature_enabled = self.yaml_parser.document_info.get('supervisor_signature', False)
-        co_supervisor_signature_enabled = self.yaml_parser.document_info.get('co_supervisor_signature', False)
-        
-        if signature_line_enabled or supervisor_signature_enabled or co_supervisor_signature_enabled:
-            print("✍️ Adding signatures...")
-            signature_generator = SignatureLineGenerator(
-                self.yaml_parser.student_info,
-                self.yaml_parser.document_info,
-                self.colors
-            )
-            signature_story = signature_generator.create_signature_line(styles)
-            story.extend(signature_story)
-
-        return story
-
-    def _print_document_structure(self):
+    def _print_document_structure(self, context):
         """Print document structure information"""
-        print("📊 Document structure:")
-
-        toc_on_table_page = self.yaml_parser.document_info.get('toc_on_table_page', False)
-        if self.markdown_parser.toc_items and toc_on_table_page:
-            print("   • Page 1: Title page with student information AND table of contents (with accurate page numbers)")
-            print("   • Page 2+: Dynamic content from markdown (numbered starting from 1)")
-        elif self.markdown_parser.toc_items:
-            print("   • Page 1: Title page with student information")
-            print("   • Page 2: Table of contents (with accurate page numbers)")
-            print("   • Page 3+: Dynamic content from markdown (numbered starting from 1)")
+        logger.info("📊 Document structure:")
+
+        toc_on_table_page = context.document_info.get('toc_on_table_page', False)
+        if context.toc_items and toc_on_table_page:
+            logger.info("   • Page 1: Title page with student information AND table of contents (with accurate page numbers)")
+            logger.info("   • Page 2+: Dynamic content from markdown (numbered starting from 1)")
+        elif context.toc_items:
+            logger.info("   • Page 1: Title page with student information")
+            logger.info("   • Page 2: Table of contents (with accurate page numbers)")
+            logger.info("   • Page 3+: Dynamic content from markdown (numbered starting from 1)")
         else:
-            print("   • Page 1: Title page with student information")
-            print("   • Page 2+: Dynamic content from markdown (numbered starting from 1)")
-        print("   • Header: Clean design without logos")
-        print("   • Footer: HHN and UniTyLab logos with university info + page numbers")
-        print("   • Design: Dynamic styling based on content structure")
-        print("   • TOC: Interactive links with ACCURATE page numbers (2-pass system)")
-        print()
\ No newline at end of file
+            logger.info("   • Page 1: Title page with student information")
+            logger.info("   • Page 2+: Dynamic content from markdown (numbered starting from 1)")
+        logger.info("   • Header: Clean design without logos")
+        logger.info("   • Footer: HHN and UniTyLab logos with university info + page numbers")
+        logger.info("   • Design: Dynamic styling based on content structure")
+        logger.info(f"   • TOC: Interactive links with ACCURATE page numbers ({self.layout_passes} layout pass(es))")
+        logger.info("")
+
+
+def generate_pdf_bytes(markdown_text, front_matter=None, base_dir=None, use_cache=True):
+    """Render markdown text into PDF bytes with a new converter (see
+    UniversalMarkdownToPDF.generate_pdf_bytes)"""
+    return UniversalMarkdownToPDF().generate_pdf_bytes(markdown_text, front_matter, base_dir, use_cache)
+
+
+def default_output_dir():
+    """The Output directory of the project, where bare output file names go"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(os.path.dirname(script_dir))
+    return os.path.join(project_root, "Output")
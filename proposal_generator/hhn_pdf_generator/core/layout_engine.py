@@ -0,0 +1,127 @@
+"""
+Converging layout engine for HHN PDF Generator
+"""
+
+import threading
+import contextlib
+from io import BytesIO
+from reportlab import rl_config
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+
+from .config import Config
+from .metrics import measure
+from .template import PageTrackingDocTemplate
+from ..utils.console import get_logger
+
+logger = get_logger(__name__)
+
+# Builds currently running with rl_config.useA85 set, and its value before
+_ascii85_lock = threading.Lock()
+_ascii85_builds = 0
+_ascii85_saved = None
+
+
+@contextlib.contextmanager
+def _ascii85(value):
+    """Set rl_config.useA85 while builds run, restoring it after the last one
+
+    ReportLab has no per-canvas switch. Concurrent builds all set the same
+    Config value, so the previous value is saved by the first build and only
+    restored when no build is running any more.
+    """
+    global _ascii85_builds, _ascii85_saved
+    with _ascii85_lock:
+        if _ascii85_builds == 0:
+            _ascii85_saved = rl_config.useA85
+        _ascii85_builds += 1
+        rl_config.useA85 = value
+    try:
+        yield
+    finally:
+        with _ascii85_lock:
+            _ascii85_builds -= 1
+            if _ascii85_builds == 0:
+                rl_config.useA85 = _ascii85_saved
+
+
+class LayoutEngine:
+    """Builds the document until the TOC page numbers match the tracked anchors
+
+    on_page and content_page_offset are passed to every PageTrackingDocTemplate.
+    Each pass is timed as phase 'pass_<n>' of metrics (a MetricsCollector).
+    """
+
+    def __init__(self, on_page=None, content_page_offset=1, max_passes=None, metrics=None):
+        self.on_page = on_page
+        self.content_page_offset = content_page_offset
+        self.max_passes = max_passes or Config.MAX_LAYOUT_PASSES
+        self.metrics = metrics
+        self.passes = 0
+        self.pages = 0  # Pages and top-level flowables of the last pass
+        self.flowables = 0
+
+    def create_doc_template(self, output=None, layout_only=False):
+        """Create the page tracking template used by every pass"""
+        return PageTrackingDocTemplate(
+            output,
+            on_page=self.on_page,
+            content_page_offset=self.content_page_offset,
+            layout_only=layout_only,
+            invariant=1,  # No timestamps or random IDs: same input, same bytes
+            pageCompression=int(Config.PDF_PAGE_COMPRESSION),
+            pagesize=A4,
+            rightMargin=2.5*cm,
+            leftMargin=2.5*cm,
+            topMargin=3*cm,
+            bottomMargin=2.5*cm
+        )
+
+    def build(self, story_builder, page_hints=None, layout_first=True):
+        """Build the document and return (pdf_bytes, page_numbers)
+
+        story_builder(doc_template, page_numbers) must return the complete story
+        with the TOC rendered from page_numbers (None means no numbers known yet).
+        A pass is final when the anchors it tracked match the numbers it printed,
+        so a correct hint finishes in a single build. Without hints and with
+        layout_first set, the first pass only paginates and produces no PDF.
+        """
+        # ReportLab reads the ASCII85 switch from its global config while saving
+        with _ascii85(int(Config.PDF_ASCII85)):
+            page_numbers = page_hints
+            self.passes = 0
+
+            if page_numbers is None and layout_first:
+                self.passes += 1
+                logger.info(f"  ↳ Pass {self.passes}: Determining page numbers (layout only)...")
+                with measure(self.metrics, f'pass_{self.passes}'):
+                    doc = self.create_doc_template(layout_only=True)
+                    self._build_pass(doc, story_builder(doc, None))
+                page_numbers = doc.get_page_tracker()
+                logger.info(f"  ↳ Tracked {len(page_numbers)} headings")
+
+            while True:
+                self.passes += 1
+                logger.info(f"  ↳ Pass {self.passes}: Building PDF...")
+
+                with measure(self.metrics, f'pass_{self.passes}'):
+                    buffer = BytesIO()
+                    doc = self.create_doc_template(buffer)
+                    self._build_pass(doc, story_builder(doc, page_numbers))
+                tracked = doc.get_page_tracker()
+
+                if tracked == (page_numbers or {}):
+                    logger.info(f"  ↳ Page numbers converged after {self.passes} pass(es)")
+                    return buffer.getvalue(), tracked
+
+                if self.passes >= self.max_passes:
+                    logger.warning(f"⚠ Warning: Page numbers did not converge after {self.passes} passes, TOC may be off")
+                    return buffer.getvalue(), tracked
+
+                logger.info(f"  ↳ Tracked {len(tracked)} headings, page numbers changed")
+                page_numbers = tracked
+
+    def _build_pass(self, doc, story):
+        self.flowables = len(story)  # The build consumes the story
+        doc.build(story)
+        self.pages = doc.page
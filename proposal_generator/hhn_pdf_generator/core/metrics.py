@@ -0,0 +1,71 @@
+"""
+Per-phase timing and document metrics of HHN PDF Generator
+"""
+
+import json
+import time
+import contextlib
+
+from ..utils.file_utils import write_file_atomic
+
+
+class MetricsCollector:
+    """Wall and CPU time per pipeline phase plus counters of one document
+
+    Phases are timed with phase(name) blocks, e.g. 'yaml', 'markdown',
+    'logos', 'pass_1', 'pass_2' and 'write'; a phase entered again adds up.
+    CPU time is that of the calling thread, so renders running in other
+    threads don't count. Counters hold pages, flowables, headings, output
+    bytes and the like. Functions in listeners are called with the name of
+    every phase that ends (e.g. RenderProfiler's memory snapshots).
+    """
+
+    def __init__(self):
+        self.phases = {}  # Name -> [wall seconds, CPU seconds]
+        self.counters = {}
+        self.listeners = []
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.thread_time()
+        self.total = None  # (wall, CPU) seconds once stopped
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            totals = self.phases.setdefault(name, [0.0, 0.0])
+            totals[0] += time.perf_counter() - wall
+            totals[1] += time.thread_time() - cpu
+            for listener in self.listeners:
+                listener(name)
+
+    def count(self, name, value):
+        self.counters[name] = value
+
+    def stop(self):
+        """Fix the total time at now (report() uses the time so far until then)"""
+        self.total = (time.perf_counter() - self.start_wall, time.thread_time() - self.start_cpu)
+
+    def report(self):
+        """Metrics as a JSON-ready dict, times in milliseconds"""
+        wall, cpu = self.total or (time.perf_counter() - self.start_wall, time.thread_time() - self.start_cpu)
+        return {
+            'total': {'wall_ms': round(wall * 1000, 2), 'cpu_ms': round(cpu * 1000, 2)},
+            'phases': {
+                name: {'wall_ms': round(phase_wall * 1000, 2), 'cpu_ms': round(phase_cpu * 1000, 2)}
+                for name, (phase_wall, phase_cpu) in self.phases.items()
+            },
+            'counters': dict(self.counters),
+        }
+
+
+def measure(metrics, name):
+    """metrics.phase(name), or a no-op without a collector"""
+    return metrics.phase(name) if metrics is not None else contextlib.nullcontext()
+
+
+def write_metrics(path, report):
+    """Write a metrics report (or a list of them) as JSON"""
+    write_file_atomic(path, json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8'))
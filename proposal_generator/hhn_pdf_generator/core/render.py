@@ -0,0 +1,280 @@
+"""
+Reentrant rendering core of HHN PDF Generator
+"""
+
+import hashlib
+from datetime import datetime
+from types import MappingProxyType
+from dataclasses import dataclass
+from reportlab.lib.units import cm
+from reportlab.platypus import Spacer, PageBreak
+
+from .config import Config
+from .layout_engine import LayoutEngine
+from .metrics import measure
+from .styles import StyleManager
+from ..utils.yaml_parser import YAMLParser
+from ..utils.markdown_parser import MarkdownParser
+from ..utils.markdown_blocks import ImageBlock
+from ..utils.output_cache import OutputCache
+from ..generators.title_page import TitlePageGenerator
+from ..generators.toc import TOCGenerator
+from ..generators.signature import SignatureLineGenerator
+from ..generators.header_footer import HeaderFooterGenerator
+from ..utils.console import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class DocumentSpec:
+    """Everything that describes one render job
+
+    markdown is the text, or an iterable of its lines with line endings
+    (e.g. read_lines() of a file) that load_document streams through
+    parsing and hashing once. front_matter is a dict or YAML text; None
+    means markdown starts with its own YAML front matter. Relative image
+    paths are resolved against base_dir. page_hints (anchor -> page number, e.g. from an earlier build
+    of the same headings) are the first guess of the TOC page numbers; a
+    wrong guess only costs another layout pass.
+    """
+    markdown: object
+    front_matter: object = None
+    base_dir: str = None
+    hhn_logo_path: str = None
+    unitylab_logo_path: str = None
+    page_hints: object = None
+    use_cache: bool = True
+
+
+@dataclass(frozen=True)
+class JobContext:
+    """Parsed, read-only state of one document, shared by all its layout passes"""
+    student_info: MappingProxyType
+    document_info: MappingProxyType
+    university_info: MappingProxyType
+    table_labels: MappingProxyType
+    toc_items: tuple
+    anchors: frozenset  # Anchors of all headings, to check that page hints still apply
+    blocks: tuple
+    hhn_logo_path: str
+    unitylab_logo_path: str
+    page_hints: object
+    cache_key: str  # None with caching off
+
+    @property
+    def content_page_offset(self):
+        """Pages before content page 1: title page, plus a separate TOC page"""
+        return 1 if self.document_info.get('toc_on_table_page', False) else 2
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """PDF bytes and facts about the build that produced them"""
+    pdf_bytes: bytes
+    page_numbers: MappingProxyType  # Anchor -> content page number
+    passes: int  # 0 for output cache hits
+    context: JobContext
+
+    @property
+    def cached(self):
+        return self.passes == 0
+
+
+def load_document(spec, section_cache=None, metrics=None):
+    """Parse a DocumentSpec into a JobContext
+
+    Front matter, headings and body blocks are parsed in a single scan with
+    parsers local to this call. section_cache is the optional dict of
+    MarkdownParser.section_cache; it belongs to the caller and must not be
+    shared between threads. metrics, a MetricsCollector, receives the
+    'yaml', 'markdown' and 'output_cache' phases and the heading count.
+    """
+    yaml_parser = YAMLParser()
+    markdown_parser = MarkdownParser()
+    markdown_parser.base_dir = spec.base_dir
+    markdown_parser.section_cache = section_cache
+
+    markdown_hash = hashlib.sha256()
+    if isinstance(spec.markdown, str):
+        markdown_hash.update(spec.markdown.encode('utf-8'))
+        lines = iter(spec.markdown.split('\n'))
+    else:
+        # Hashed while streaming: the digest equals that of the joined text
+        lines = (line.rstrip('\n') for line in _hash_lines(spec.markdown, markdown_hash))
+    with measure(metrics, 'yaml'):
+        if spec.front_matter is None:
+            yaml_parser.read_frontmatter(lines)
+        elif isinstance(spec.front_matter, str):
+            yaml_parser.parse_yaml_block(spec.front_matter)
+        else:
+            yaml_parser.parse_yaml_data(spec.front_matter)
+    with measure(metrics, 'markdown'):
+        blocks = markdown_parser.scan_lines(lines, yaml_parser.document_info)
+    if metrics is not None:
+        metrics.count('headings', len(markdown_parser.toc_items))
+
+    cache_key = None
+    if spec.use_cache:
+        with measure(metrics, 'output_cache'):
+            cache_key = OutputCache().compute_key(
+                markdown_hash.digest(),
+                _document_state(yaml_parser),
+                (spec.hhn_logo_path, spec.unitylab_logo_path),
+                [block.path for block in blocks if isinstance(block, ImageBlock)]
+            )
+
+    return JobContext(
+        student_info=MappingProxyType(dict(yaml_parser.student_info)),
+        document_info=MappingProxyType(dict(yaml_parser.document_info)),
+        university_info=MappingProxyType(dict(yaml_parser.university_info)),
+        table_labels=MappingProxyType(dict(yaml_parser.table_labels)),
+        toc_items=tuple(MappingProxyType(item) for item in markdown_parser.toc_items),
+        anchors=frozenset(item['anchor'] for item in markdown_parser.toc_items),
+        blocks=tuple(blocks),
+        hhn_logo_path=spec.hhn_logo_path,
+        unitylab_logo_path=spec.unitylab_logo_path,
+        page_hints=spec.page_hints,
+        cache_key=cache_key,
+    )
+
+
+def render_document(context, styles=None, metrics=None):
+    """Lay out and render a JobContext; returns a RenderResult
+
+    Takes the PDF from the output cache when context.cache_key is set and
+    stores fresh renders there. Safe to run in many threads at once: the
+    stylesheet (default: the shared one of StyleManager) and Config are
+    only read, the module caches of images and highlighted code are keyed
+    by content and everything else lives in this call. metrics, a
+    MetricsCollector, receives one phase per layout pass ('pass_1', ...)
+    and the page, flowable and output byte counts.
+    """
+    if context.cache_key:
+        with measure(metrics, 'output_cache'):
+            pdf_bytes = OutputCache().load(context.cache_key)
+        if pdf_bytes is not None:
+            logger.info("♻️ Output cache hit, document unchanged")
+            if metrics is not None:
+                metrics.count('layout_passes', 0)
+                metrics.count('output_bytes', len(pdf_bytes))
+            return RenderResult(pdf_bytes, MappingProxyType(dict(context.page_hints or {})), 0, context)
+
+    # Converging layout: rebuild only while TOC page numbers still change
+    logger.info("🔨 Building PDF with accurate page numbers (converging layout)...")
+    styles = styles or StyleManager().get_styles()
+    toc_generator = TOCGenerator(context.toc_items, context.document_info)
+
+    def story_builder(doc_template, page_numbers):
+        toc_generator.set_actual_page_numbers(page_numbers or {})
+        return _build_story(context, styles, doc_template, toc_generator)
+
+    header_footer = HeaderFooterGenerator(
+        context.university_info, context.hhn_logo_path, context.unitylab_logo_path
+    )
+    layout_engine = LayoutEngine(header_footer.create_header_footer, context.content_page_offset, metrics=metrics)
+    pdf_bytes, page_numbers = layout_engine.build(
+        story_builder,
+        page_hints=dict(context.page_hints) if context.page_hints is not None else None,
+        layout_first=bool(context.toc_items)
+    )
+    if metrics is not None:
+        metrics.count('layout_passes', layout_engine.passes)
+        metrics.count('pages', layout_engine.pages)
+        metrics.count('flowables', layout_engine.flowables)
+        metrics.count('output_bytes', len(pdf_bytes))
+
+    if context.cache_key:
+        with measure(metrics, 'output_cache'):
+            OutputCache().store(context.cache_key, pdf_bytes)
+
+    return RenderResult(pdf_bytes, MappingProxyType(page_numbers), layout_engine.passes, context)
+
+
+def render(spec, styles=None, metrics=None):
+    """Render a DocumentSpec into a RenderResult (load_document + render_document)"""
+    return render_document(load_document(spec, metrics=metrics), styles, metrics)
+
+
+def _hash_lines(lines, hasher):
+    """Pass lines through, feeding each one to hasher"""
+    for line in lines:
+        hasher.update(line.encode('utf-8'))
+        yield line
+
+
+def _document_state(yaml_parser):
+    """Parsed front matter and other inputs of the output cache key"""
+    state = {
+        'student_info': yaml_parser.student_info,
+        'document_info': yaml_parser.document_info,
+        'university_info': yaml_parser.university_info,
+        'table_labels': yaml_parser.table_labels,
+    }
+    # The signature block prints today's date
+    if yaml_parser.document_info.get('signature_line', False):
+        state['signature_date'] = datetime.now().strftime("%d.%m.%Y")
+    return state
+
+
+def _build_story(context, styles, doc_template, toc_generator):
+    """Build the complete story with TOC page numbers from the toc_generator"""
+    story = []
+    document_info = context.document_info
+
+    logger.info("📄 Creating title page...")
+    title_generator = TitlePageGenerator(
+        context.student_info,
+        document_info,
+        context.university_info,
+        context.table_labels,
+        context  # Provides hhn_logo_path and unitylab_logo_path
+    )
+    story.extend(title_generator.create_title_page(styles))
+
+    # Check if TOC should be on the same page or separate page
+    toc_on_table_page = document_info.get('toc_on_table_page', False)
+
+    logger.info("📝 Processing markdown content...")
+    content_story = MarkdownParser().create_flowables(
+        context.blocks, styles, document_info, doc_template
+    )
+
+    logger.info("📋 Creating table of contents...")
+    toc = toc_generator.create_table_of_contents(styles, use_actual_pages=True)
+
+    if toc:
+        if toc_on_table_page:
+            # Add TOC on the same page as title page
+            logger.info("  ↳ Adding TOC on title page")
+            story.append(Spacer(1, 1*cm))  # Add some space
+            story.extend(toc)
+            story.append(PageBreak())  # Page break after title+TOC
+        else:
+            # Add TOC on separate page
+            logger.info("  ↳ Adding TOC on separate page")
+            story.append(PageBreak())  # Page break after title page
+            story.extend(toc)
+            story.append(PageBreak())  # Page break after TOC
+    else:
+        story.append(PageBreak())  # Just page break after title if no TOC
+
+    # Add the processed content (this is where page tracking happens)
+    story.extend(content_story)
+
+    # Add signatures (author and supervisors integrated)
+    signature_line_enabled = document_info.get('signature_line', False)
+    supervisor_signature_enabled = document_info.get('supervisor_signature', False)
+    co_supervisor_signature_enabled = document_info.get('co_supervisor_signature', False)
+
+    if signature_line_enabled or supervisor_signature_enabled or co_supervisor_signature_enabled:
+        logger.info("✍️ Adding signatures...")
+        signature_generator = SignatureLineGenerator(
+            context.student_info,
+            document_info,
+            Config.COLORS
+        )
+        signature_story = signature_generator.create_signature_line(styles)
+        story.extend(signature_story)
+
+    return story
@@ -2,17 +2,55 @@
 Style definitions for HHN PDF Generator
 """
 
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+import threading
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
+from reportlab.lib.colors import white
 from .config import Config
 
 
+# Process-wide stylesheets keyed by the color values they were built from
+_stylesheet_cache = {}
+_stylesheet_lock = threading.Lock()
+
+
+class FrozenStyleSheet(StyleSheet1):
+    """Read-only stylesheet shared by all documents of a process
+    
+    Styles can't be added; derive variants with style.clone() instead of
+    modifying the shared ParagraphStyle objects.
+    """
+    
+    def __init__(self, stylesheet):
+        StyleSheet1.__init__(self)
+        self.byName.update(stylesheet.byName)
+        self.byAlias.update(stylesheet.byAlias)
+    
+    def add(self, style, alias=None):
+        raise TypeError("Shared stylesheet is read-only, use StyleManager.create_styles() for a private copy")
+
+
 class StyleManager:
     """Manages styles for PDF generation"""
     
     def __init__(self):
         self.colors = Config.COLORS
     
+    def get_styles(self):
+        """Return the shared stylesheet for the current colors, built once per process"""
+        key = tuple(
+            (name, color.red, color.green, color.blue, color.alpha)
+            for name, color in sorted(self.colors.items())
+        )
+        styles = _stylesheet_cache.get(key)
+        if styles is None:
+            with _stylesheet_lock:
+                styles = _stylesheet_cache.get(key)
+                if styles is None:
+                    styles = FrozenStyleSheet(self.create_styles())
+                    _stylesheet_cache[key] = styles
+        return styles
+    
     def create_styles(self):
         """Create dynamic styles for different heading levels and content"""
         styles = getSampleStyleSheet()
@@ -98,6 +136,18 @@ class StyleManager:
             borderPadding=8
         ))
         
+        # Caption below images
+        styles.add(ParagraphStyle(
+            name='ImageCaption',
+            parent=styles['Normal'],
+            fontSize=9,
+            leading=12,
+            spaceBefore=4,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Oblique',
+            textColor=self.colors['secondary']
+        ))
+        
         # Quote style
         styles.add(ParagraphStyle(
             name='Quote',
@@ -123,6 +173,23 @@ class StyleManager:
             fontName='Helvetica'
         ))
         
+        # Table cell styles, one per column alignment (TableCell, TableCellCenter, ...)
+        for suffix, alignment in (('', TA_LEFT), ('Center', TA_CENTER), ('Right', TA_RIGHT)):
+            styles.add(ParagraphStyle(
+                name=f'TableCell{suffix}',
+                parent=styles['Normal'],
+                fontSize=10,
+                leading=13,
+                alignment=alignment,
+                fontName='Helvetica'
+            ))
+            styles.add(ParagraphStyle(
+                name=f'TableHeader{suffix}',
+                parent=styles[f'TableCell{suffix}'],
+                fontName='Helvetica-Bold',
+                textColor=white
+            ))
+        
         # TOC entry styles for different levels
         for i in range(1, 7):
             styles.add(ParagraphStyle(
@@ -136,4 +203,37 @@ class StyleManager:
                 textColor=self.colors['primary'] if i <= 2 else self.colors['secondary']
             ))
         
+        # Signature styles
+        styles.add(ParagraphStyle(
+            name='AuthorSignatureStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            fontName='Helvetica-Bold',
+            alignment=TA_LEFT,
+            textColor=self.colors['primary']
+        ))
+        
+        styles.add(ParagraphStyle(
+            name='DateStyle',
+            parent=styles['Normal'],
+            fontSize=9,
+            fontName='Helvetica',
+            alignment=TA_LEFT,
+            textColor=self.colors['secondary']
+        ))
+        
+        styles.add(ParagraphStyle(
+            name='SupervisorSignatureStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            fontName='Helvetica-Bold',
+            alignment=TA_RIGHT,
+            textColor=self.colors['primary']
+        ))
+        
+        styles.add(ParagraphStyle(
+            name='CoSupervisorSignatureStyle',
+            parent=styles['SupervisorSignatureStyle']
+        ))
+        
         return styles
\ No newline at end of file
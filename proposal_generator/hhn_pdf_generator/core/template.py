@@ -2,21 +2,62 @@
 Custom document template for HHN PDF Generator
 """
 
+from io import BytesIO
 from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
 from reportlab.platypus.frames import Frame
 
 
+def _skip_draw(*args, **kwargs):
+    """Stand-in for Flowable.drawOn while laying out only"""
+
+
+class LayoutOnlyFrame(Frame):
+    """Frame that positions flowables without drawing them
+    
+    Flowables that set track_in_layout (e.g. AnchorTracker) are still drawn
+    so that anchor page numbers are recorded.
+    """
+    
+    def _add(self, flowable, canv, trySplit=0):
+        if getattr(flowable, 'track_in_layout', False):
+            return Frame._add(self, flowable, canv, trySplit)
+        
+        flowable.drawOn = _skip_draw
+        try:
+            return Frame._add(self, flowable, canv, trySplit)
+        finally:
+            del flowable.drawOn
+    
+    add = _add  # Frame binds add to its own _add
+
+
 class PageTrackingDocTemplate(BaseDocTemplate):
-    """Custom document template that tracks page numbers for TOC generation"""
+    """Custom document template that tracks page numbers for TOC generation
     
-    def __init__(self, filename, pdf_generator=None, **kwargs):
+    on_page(canvas, doc) draws header and footer of every page;
+    content_page_offset is the number of pages before content page 1 (the
+    title page, plus the TOC page unless the TOC is on the title page).
+    With layout_only=True the document is paginated but never drawn or
+    serialized: no header/footer painting, no image embedding and no output
+    bytes, only the anchor page numbers are collected.
+    """
+    
+    def __init__(self, filename=None, on_page=None, content_page_offset=1, layout_only=False, **kwargs):
+        if filename is None:
+            filename = BytesIO()
         BaseDocTemplate.__init__(self, filename, **kwargs)
-        self.pdf_generator = pdf_generator
+        self.on_page = on_page
+        self.layout_only = layout_only
         self.page_tracker = {}  # Track anchors and their page numbers
         self.current_page = 1
+        self.content_page_offset = content_page_offset
+        
+        if layout_only:
+            self._doSave = 0  # Skip canvas serialization
         
         # Create frame for content
-        frame = Frame(
+        frame_class = LayoutOnlyFrame if layout_only else Frame
+        frame = frame_class(
             self.leftMargin, self.bottomMargin,
             self.width, self.height,
             id='main_frame'
@@ -27,8 +68,8 @@ class PageTrackingDocTemplate(BaseDocTemplate):
             # Track current page number
             self.current_page = canvas.getPageNumber()
             
-            if self.pdf_generator:
-                self.pdf_generator.create_header_footer(canvas, doc)
+            if self.on_page and not self.layout_only:
+                self.on_page(canvas, doc)
         
         template = PageTemplate(
             id='main_template', 
@@ -40,14 +81,7 @@ class PageTrackingDocTemplate(BaseDocTemplate):
     def track_anchor(self, anchor_name, page_offset=0):
         """Track an anchor and its page number"""
         # Calculate actual content page number (subtract TOC pages)
-        if self.pdf_generator and hasattr(self.pdf_generator, 'yaml_parser'):
-            toc_on_table_page = self.pdf_generator.yaml_parser.document_info.get('toc_on_table_page', False)
-            if toc_on_table_page:
-                content_page = max(1, self.current_page - 1 + page_offset)
-            else:
-                content_page = max(1, self.current_page - 2 + page_offset)
-        else:
-            content_page = max(1, self.current_page - 1 + page_offset)
+        content_page = max(1, self.current_page - self.content_page_offset + page_offset)
         
         self.page_tracker[anchor_name] = content_page
         
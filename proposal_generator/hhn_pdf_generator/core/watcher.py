@@ -0,0 +1,77 @@
+"""
+Watch mode for HHN PDF Generator
+"""
+
+import os
+import time
+
+from ..core.generator import UniversalMarkdownToPDF
+from ..core.config import Config
+from ..utils.logo_handler import LogoHandler
+from ..utils.console import get_logger
+
+logger = get_logger(__name__)
+
+
+class DocumentWatcher:
+    """Rebuilds a document whenever its markdown file changes
+
+    One converter stays warm for the whole session: logos are fetched once,
+    the stylesheet is built once, unchanged sections keep their parsed blocks
+    and line breaks, and the page numbers of the last build seed the next
+    one, so an edit that moves no heading to another page takes one pass.
+    """
+
+    def __init__(self, input_file, output_file=None, poll_interval=None, use_cache=True):
+        self.input_file = input_file
+        self.output_file = output_file
+        self.poll_interval = poll_interval or Config.WATCH_POLL_INTERVAL
+        self.use_cache = use_cache
+
+        self.logo_handler = LogoHandler()
+        self.converter = UniversalMarkdownToPDF(input_file, logo_handler=self.logo_handler)
+        self.converter.section_cache = {}
+
+    def _file_state(self):
+        """Modification time and size of the input, None while it is missing"""
+        try:
+            stat = os.stat(self.input_file)
+        except FileNotFoundError:
+            # Editors that save by renaming briefly remove the file
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def rebuild(self):
+        """Rebuild the PDF once; errors are reported and watching goes on"""
+        start = time.perf_counter()
+        try:
+            self.converter.generate_pdf(self.input_file, self.output_file, use_cache=self.use_cache)
+        except Exception as e:
+            logger.error(f"❌ Error: {e}")
+            return False
+
+        logger.info(f"⏱️ Rebuilt in {time.perf_counter() - start:.2f}s ({self.converter.layout_passes} layout pass(es))")
+        return True
+
+    def run(self):
+        """Build once, then rebuild on every change until interrupted"""
+        logger.info(f"👀 Watching {self.input_file} for changes (Ctrl+C to stop)")
+        self.logo_handler.download_logos()
+
+        try:
+            last_state = self._file_state()
+            self.rebuild()
+
+            while True:
+                time.sleep(self.poll_interval)
+                state = self._file_state()
+                if state is None or state == last_state:
+                    continue
+
+                last_state = state
+                logger.info(f"🔄 Change detected in {self.input_file}")
+                self.rebuild()
+        except KeyboardInterrupt:
+            logger.info("👋 Stopped watching")
+        finally:
+            self.logo_handler.cleanup_logos()
@@ -0,0 +1,351 @@
+"""
+Supervised worker processes for HHN PDF Generator
+
+Unlike a ProcessPoolExecutor, a WorkerPool can stop a single runaway job:
+the worker running it is killed and replaced while all other jobs go on.
+"""
+
+import os
+import time
+import signal
+import socket
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+from .config import Config
+
+
+class JobKilledError(RuntimeError):
+    """A job that was stopped by killing its worker process
+
+    reason is 'timeout', 'memory', 'crash' (the worker died on its own,
+    e.g. at the hands of the OS out-of-memory killer) or 'shutdown' (the
+    pool was closed with kill=True); seconds is how long the job had been
+    running.
+    """
+
+    def __init__(self, reason, message, seconds=0.0):
+        super().__init__(message)
+        self.reason = reason
+        self.seconds = seconds
+
+
+def process_rss(pid):
+    """Resident memory of a process in bytes, None where it can't be measured
+
+    Reads /proc on Linux; elsewhere psutil is used if it is installed.
+    """
+    try:
+        with open(f'/proc/{pid}/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return None
+
+
+def _worker_main(connection, initializer, initargs):
+    """Worker process: prepare, then run jobs from connection until told to stop"""
+    # Ctrl+C reaches the whole process group; the pool decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if initializer is not None:
+        initializer(*initargs)
+    connection.send(None)  # Ready for jobs
+
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            break  # Parent is gone
+        if job is None:
+            break
+        function, args = job
+        try:
+            reply = (True, function(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            connection.send(reply)
+        except Exception as e:
+            # Result or exception can't be pickled
+            connection.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    """Parent side of one worker process"""
+
+    def __init__(self, context, initializer, initargs):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_connection, initializer, initargs),
+            daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.ready = False
+        self.jobs = 0
+        self.future = None
+        self.started = None  # time.monotonic() when the current job was sent
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool:
+    """Process pool that enforces per-job limits and recycles its workers
+
+    Jobs run in `workers` processes, each prepared once by
+    initializer(*initargs). A supervisor thread kills the worker of a job
+    that runs longer than job_timeout seconds or grows beyond max_rss_mb
+    megabytes of resident memory; the job fails with JobKilledError and a
+    fresh worker takes the place of the killed one. After
+    max_jobs_per_worker jobs (or a job that left it above max_rss_mb) a
+    worker is retired and replaced, which bounds memory that ReportLab and
+    PIL keep between documents. Limits default to Config.WORKER_*; 0
+    disables a limit.
+    """
+
+    def __init__(self, workers, initializer=None, initargs=(),
+                 job_timeout=None, max_rss_mb=None, max_jobs_per_worker=None):
+        self.workers = workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self.job_timeout = Config.WORKER_JOB_TIMEOUT if job_timeout is None else job_timeout
+        self.max_rss_mb = Config.WORKER_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.max_jobs_per_worker = Config.WORKER_MAX_JOBS if max_jobs_per_worker is None else max_jobs_per_worker
+        self.killed = {'timeout': 0, 'memory': 0, 'crash': 0}
+        self.recycled = 0
+
+        self._context = multiprocessing.get_context()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._pending = deque()
+        self._closing = False
+        self._kill_on_close = False
+        self._broken = None  # Error message once workers can't be started
+        self._retired = []
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_writer.setblocking(False)
+        self._workers = [self._start_worker() for _ in range(workers)]
+        self._supervisor = threading.Thread(target=self._supervise, name='hhn_worker_pool', daemon=True)
+        self._supervisor.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        # Don't wait for running jobs when leaving with an error (e.g. Ctrl+C)
+        self.close(kill=exc_type is not None)
+
+    def submit(self, function, *args):
+        """Schedule function(*args) in a worker; returns a Future
+
+        function, args and the result must be picklable.
+        """
+        future = Future()
+        with self._lock:
+            if self._broken:
+                raise RuntimeError(self._broken)
+            if self._closing:
+                raise RuntimeError("Cannot submit jobs to a closed worker pool")
+            self._pending.append((future, function, args))
+        self._wake()
+        return future
+
+    def wait_ready(self):
+        """Block until every worker has run its initializer"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._broken or all(worker.ready for worker in self._workers))
+            if self._broken:
+                raise RuntimeError(self._broken)
+
+    def close(self, kill=False):
+        """Stop all workers once the submitted jobs are done
+
+        With kill=True queued jobs are cancelled and running ones killed.
+        """
+        pending = ()
+        with self._lock:
+            self._closing = True
+            if kill:
+                self._kill_on_close = True
+                pending, self._pending = self._pending, deque()
+        for future, _, _ in pending:
+            future.cancel()
+        self._wake()
+        if threading.current_thread() is not self._supervisor:
+            self._supervisor.join()
+
+    def _wake(self):
+        try:
+            self._wakeup_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass  # A wake-up is already pending, or the pool is closed
+
+    def _start_worker(self):
+        return _Worker(self._context, self.initializer, self.initargs)
+
+    def _supervise(self):
+        try:
+            while self._supervise_step():
+                pass
+        finally:
+            for worker in self._workers:
+                if worker.future is not None:
+                    worker.future.set_exception(JobKilledError('shutdown', "Worker pool shut down"))
+                if worker.process.is_alive() and worker.ready and not self._kill_on_close:
+                    self._retire(worker)
+                else:
+                    worker.kill()
+            for process in self._retired:
+                process.join()
+            self._wakeup_reader.close()
+            self._wakeup_writer.close()
+
+    def _supervise_step(self):
+        """One round of the supervisor; returns False once the pool has shut down"""
+        busy = [worker for worker in self._workers if worker.future is not None]
+        if self._closing and (self._kill_on_close or not (busy or self._pending)):
+            return False
+
+        limited = busy and (self.job_timeout or self.max_rss_mb)
+        timeout = Config.WORKER_POLL_INTERVAL if limited else None
+        connections = {worker.connection: worker for worker in self._workers}
+        for ready in wait(list(connections) + [self._wakeup_reader], timeout):
+            if ready is self._wakeup_reader:
+                self._wakeup_reader.recv(4096)
+            else:
+                self._receive(connections[ready])
+
+        self._enforce_limits()
+        self._reap_retired()
+        if not self._broken:
+            self._dispatch()
+        return True
+
+    def _receive(self, worker):
+        """Handle a message of worker: ready, a job result, or EOF if it died"""
+        try:
+            message = worker.connection.recv()
+        except (EOFError, OSError):
+            worker.process.join()
+            if not worker.ready:
+                self._fail_start(worker)
+            else:
+                exit_code = worker.process.exitcode
+                self._replace(worker, 'crash', f"Worker process exited unexpectedly (exit code {exit_code})")
+            return
+
+        if not worker.ready:
+            with self._changed:
+                worker.ready = True
+                self._changed.notify_all()
+            return
+
+        ok, value = message
+        future, worker.future = worker.future, None
+        worker.jobs += 1
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+        rss = process_rss(worker.process.pid) if self.max_rss_mb else None
+        if (self.max_jobs_per_worker and worker.jobs >= self.max_jobs_per_worker) or \
+                (rss is not None and rss > self.max_rss_mb * 1024 * 1024):
+            self.recycled += 1
+            self._retire(worker)
+            self._swap(worker, None if self._kill_on_close else self._start_worker())
+
+    def _enforce_limits(self):
+        """Kill workers whose job is over the time or memory limit"""
+        now = time.monotonic()
+        for worker in list(self._workers):
+            if worker.future is None:
+                continue
+            seconds = now - worker.started
+            if self.job_timeout and seconds > self.job_timeout:
+                self._replace(worker, 'timeout', f"Killed after {self.job_timeout:g}s (job timeout)")
+                continue
+            if self.max_rss_mb:
+                rss = process_rss(worker.process.pid)
+                if rss is not None and rss > self.max_rss_mb * 1024 * 1024:
+                    self._replace(
+                        worker, 'memory',
+                        f"Killed at {rss / (1024 * 1024):.0f} MB resident memory (limit {self.max_rss_mb:g} MB)"
+                    )
+
+    def _replace(self, worker, reason, message):
+        """Kill worker, fail its job with JobKilledError and start a fresh worker"""
+        future, worker.future = worker.future, None
+        seconds = time.monotonic() - worker.started if worker.started else 0.0
+        worker.kill()
+        self._swap(worker, None if self._kill_on_close else self._start_worker())
+        if future is not None:
+            self.killed[reason] += 1
+            future.set_exception(JobKilledError(reason, message, seconds))
+
+    def _retire(self, worker):
+        """Let an idle worker exit on its own"""
+        try:
+            worker.connection.send(None)
+        except OSError:
+            pass
+        worker.connection.close()
+        self._retired.append(worker.process)
+
+    def _reap_retired(self):
+        for process in [process for process in self._retired if not process.is_alive()]:
+            process.join()
+            self._retired.remove(process)
+
+    def _swap(self, worker, replacement):
+        with self._changed:
+            self._workers.remove(worker)
+            if replacement is not None:
+                self._workers.append(replacement)
+            self._changed.notify_all()
+
+    def _fail_start(self, worker):
+        """A worker died in its initializer: fail all jobs instead of restarting it forever"""
+        message = f"Worker process failed to start (exit code {worker.process.exitcode})"
+        worker.connection.close()
+        with self._changed:
+            self._workers.remove(worker)
+            self._broken = message
+            pending, self._pending = self._pending, deque()
+            self._changed.notify_all()
+        for future, _, _ in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError(message))
+
+    def _dispatch(self):
+        """Send queued jobs to idle workers"""
+        for worker in self._workers:
+            if not worker.ready or worker.future is not None:
+                continue
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        return
+                    future, function, args = self._pending.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue  # Cancelled while queued
+                try:
+                    worker.connection.send((function, args))
+                except Exception as e:
+                    # Arguments can't be pickled; a dead worker is noticed by _receive
+                    future.set_exception(e)
+                    continue
+                worker.future = future
+                worker.started = time.monotonic()
+                break
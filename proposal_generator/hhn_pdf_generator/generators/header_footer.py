@@ -0,0 +1,98 @@
+"""
+Header and footer generator for HHN PDF
+"""
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from ..core.config import Config
+from ..utils.console import get_logger
+
+logger = get_logger(__name__)
+
+
+class HeaderFooterGenerator:
+    """Draws the footer with logos, university info and page numbers
+
+    Only holds read-only values of one document, so one instance can be
+    shared by all layout passes of that document.
+    """
+
+    # Name of the form XObject holding the static part of the footer
+    FOOTER_FORM_NAME = 'hhn_footer'
+
+    def __init__(self, university_info, hhn_logo_path=None, unitylab_logo_path=None):
+        self.university_info = university_info
+        self.hhn_logo_path = hhn_logo_path
+        self.unitylab_logo_path = unitylab_logo_path
+        self.colors = Config.COLORS
+
+    def create_header_footer(self, canvas, doc):
+        """Create professional header and footer with logos and page numbers"""
+        canvas.saveState()
+
+        page_num = canvas.getPageNumber()
+
+        # Skip header/footer on title page (page 1)
+        if page_num == 1:
+            canvas.restoreState()
+            return
+
+        # Calculate effective page number (TOC pages don't count as content pages)
+        # If TOC is on title page: page 2+ becomes content page 1+
+        # If TOC is on separate page: page 3+ becomes content page 1+
+        content_page_num = page_num - doc.content_page_offset
+
+        # Only show page numbers on content pages (not on TOC-only pages)
+        show_page_number = content_page_num > 0
+
+        # Logos and university info are the same on every page: record them
+        # once per document as a form XObject and only reference it per page
+        if not canvas.hasForm(self.FOOTER_FORM_NAME):
+            canvas.beginForm(self.FOOTER_FORM_NAME)
+            self.draw_static_footer(canvas)
+            canvas.endForm()
+        canvas.doForm(self.FOOTER_FORM_NAME)
+
+        # Add page number in center of footer (only for content pages)
+        if show_page_number:
+            canvas.setFont('Helvetica', 9)
+            canvas.setFillColor(self.colors['primary'])
+            canvas.drawCentredString(A4[0]/2, 0.8*cm, f"Page {content_page_num}")
+
+        canvas.restoreState()
+
+    def draw_static_footer(self, canvas):
+        """Draw the page-independent part of the footer (logos and university info)"""
+        # Footer with university info and logos
+        canvas.setFont('Helvetica', 8)
+        canvas.setFillColor(self.colors['secondary'])
+
+        # HHN logo (left side of footer)
+        if self.hhn_logo_path:
+            try:
+                canvas.drawImage(self.hhn_logo_path, 2*cm, 0.5*cm,
+                               width=2.5*cm, height=0.8*cm, preserveAspectRatio=True)
+                # University info next to HHN logo (left side)
+                canvas.setFont('Helvetica', 7)
+                canvas.drawString(5*cm, 1.0*cm, self.university_info['name'])
+                canvas.drawString(5*cm, 0.7*cm, self.university_info['subtitle'])
+            except Exception as e:
+                logger.warning(f"Warning: Could not add HHN logo to footer: {e}")
+        else:
+            # University info fallback (left side)
+            canvas.setFont('Helvetica', 7)
+            canvas.drawString(2*cm, 1.0*cm, self.university_info['name'])
+            canvas.drawString(2*cm, 0.7*cm, self.university_info['subtitle'])
+
+        # UniTyLab logo (right side of footer)
+        if self.unitylab_logo_path:
+            try:
+                canvas.drawImage(self.unitylab_logo_path, A4[0]-4.5*cm, 0.5*cm,
+                               width=2.5*cm, height=0.8*cm, preserveAspectRatio=True)
+            except Exception as e:
+                logger.warning(f"Warning: Could not add UniTyLab logo to footer: {e}")
+        else:
+            # UniTyLab text fallback (right side)
+            canvas.setFont('Helvetica', 7)
+            canvas.drawRightString(A4[0]-2*cm, 1.0*cm, "UniTyLab")
+            canvas.drawRightString(A4[0]-2*cm, 0.7*cm, "University Technology Lab")
@@ -6,7 +6,7 @@ from datetime import datetime
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 from reportlab.platypus.flowables import HRFlowable
 from reportlab.lib.units import cm
-from reportlab.lib.enums import TA_LEFT, TA_RIGHT
+from ..utils.inline_markdown import escape_markup
 
 
 class SignatureLineGenerator:
@@ -45,21 +45,11 @@ class SignatureLineGenerator:
                 
                 # Author name
                 author_name = self.student_info.get('name', 'Author Name')
-                author_style = styles['Normal'].clone('AuthorSignatureStyle')
-                author_style.fontSize = 10
-                author_style.fontName = 'Helvetica-Bold'
-                author_style.alignment = TA_LEFT
-                author_style.textColor = self.colors['primary']
-                left_content.append(Paragraph(author_name.upper(), author_style))
+                left_content.append(Paragraph(escape_markup(author_name.upper()), styles['AuthorSignatureStyle']))
                 
                 # Author date
                 current_date = datetime.now().strftime("%d.%m.%Y")
-                date_style = styles['Normal'].clone('DateStyle')
-                date_style.fontSize = 9
-                date_style.fontName = 'Helvetica'
-                date_style.alignment = TA_LEFT
-                date_style.textColor = self.colors['secondary']
-                left_content.append(Paragraph(current_date, date_style))
+                left_content.append(Paragraph(current_date, styles['DateStyle']))
             
             # Right column - Main Supervisor signature
             right_content = []
@@ -71,12 +61,7 @@ class SignatureLineGenerator:
                 
                 # Supervisor name
                 supervisor_name = self.student_info.get('supervisor', 'Supervisor')
-                supervisor_style = styles['Normal'].clone('SupervisorSignatureStyle')
-                supervisor_style.fontSize = 10
-                supervisor_style.fontName = 'Helvetica-Bold'
-                supervisor_style.alignment = TA_RIGHT
-                supervisor_style.textColor = self.colors['primary']
-                right_content.append(Paragraph(supervisor_name.upper(), supervisor_style))
+                right_content.append(Paragraph(escape_markup(supervisor_name.upper()), styles['SupervisorSignatureStyle']))
             
             # Create table for author and main supervisor
             if left_content or right_content:
@@ -108,13 +93,7 @@ class SignatureLineGenerator:
             story.append(Spacer(1, 0.3*cm))
             
             co_supervisor_name = self.student_info.get('co_supervisor', 'Co-Supervisor')
-            co_supervisor_style = styles['Normal'].clone('CoSupervisorSignatureStyle')
-            co_supervisor_style.fontSize = 10
-            co_supervisor_style.fontName = 'Helvetica-Bold'
-            co_supervisor_style.alignment = TA_RIGHT
-            co_supervisor_style.textColor = self.colors['primary']
-            
-            story.append(Paragraph(co_supervisor_name.upper(), co_supervisor_style))
+            story.append(Paragraph(escape_markup(co_supervisor_name.upper()), styles['CoSupervisorSignatureStyle']))
         
         # Add space after signatures
         story.append(Spacer(1, 1*cm))
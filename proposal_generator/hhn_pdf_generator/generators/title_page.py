@@ -7,6 +7,10 @@ from reportlab.platypus import Paragraph, Spacer, Image, Table, TableStyle, Keep
 from reportlab.platypus.flowables import HRFlowable
 from reportlab.lib.units import cm
 from ..core.config import Config
+from ..utils.inline_markdown import escape_markup, format_inline
+from ..utils.console import get_logger
+
+logger = get_logger(__name__)
 
 
 class TitlePageGenerator:
@@ -34,8 +38,8 @@ class TitlePageGenerator:
             story.append(Spacer(1, 2*cm))
         
         # University information
-        story.append(Paragraph(self.university_info['name'], styles['ThesisTitle']))
-        story.append(Paragraph(self.university_info['subtitle'], styles['DocumentTitle']))
+        story.append(Paragraph(escape_markup(self.university_info['name']), styles['ThesisTitle']))
+        story.append(Paragraph(escape_markup(self.university_info['subtitle']), styles['DocumentTitle']))
         story.append(Spacer(1, 1.5*cm))
         
         # Decorative line
@@ -43,23 +47,24 @@ class TitlePageGenerator:
         story.append(Spacer(1, 1*cm))
         
         # Document type
-        story.append(Paragraph(self.document_info['type'], styles['DocumentTitle']))
+        story.append(Paragraph(escape_markup(self.document_info['type']), styles['DocumentTitle']))
         story.append(Spacer(1, 1*cm))
         
-        # Document title
+        # Document title and subtitle, with inline markdown like the headings
+        # they may be detected from
         if self.document_info['title']:
-            title_text = f"<b>{self.document_info['title']}</b>"
+            title_text = f"<b>{format_inline(self.document_info['title'])}</b>"
             story.append(Paragraph(title_text, styles['ThesisTitle']))
             story.append(Spacer(1, 0.5*cm))
         
         # Subtitle if available
         if self.document_info.get('subtitle'):
-            subtitle_text = f"<i>{self.document_info['subtitle']}</i>"
+            subtitle_text = f"<i>{format_inline(self.document_info['subtitle'])}</i>"
             story.append(Paragraph(subtitle_text, styles['ThesisSubtitle']))
             story.append(Spacer(1, 0.5*cm))
         
         # Author name (subtle)
-        author_text = f"<i>by {self.student_info['name']}</i>"
+        author_text = f"<i>by {escape_markup(self.student_info['name'])}</i>"
         story.append(Paragraph(author_text, styles['AuthorStyle']))
         story.append(Spacer(1, 1.5*cm))
         
@@ -81,7 +86,7 @@ class TitlePageGenerator:
                 logo_data = [[hhn_logo, unitylab_logo]]
                 logo_table = Table(logo_data, colWidths=[8*cm, 8*cm])
             except Exception as e:
-                print(f"Warning: Could not add logos to title page: {e}")
+                logger.warning(f"Warning: Could not add logos to title page: {e}")
         elif self.logo_handler.hhn_logo_path:
             # Only HHN logo - add UniTyLab text
             try:
@@ -90,7 +95,7 @@ class TitlePageGenerator:
                 logo_data = [[hhn_logo, unitylab_text]]
                 logo_table = Table(logo_data, colWidths=[8*cm, 8*cm])
             except Exception as e:
-                print(f"Warning: Could not add HHN logo to title page: {e}")
+                logger.warning(f"Warning: Could not add HHN logo to title page: {e}")
         elif self.logo_handler.unitylab_logo_path:
             # Only UniTyLab logo
             try:
@@ -98,7 +103,7 @@ class TitlePageGenerator:
                 logo_data = [[unitylab_logo]]
                 logo_table = Table(logo_data, colWidths=[16*cm])
             except Exception as e:
-                print(f"Warning: Could not add UniTyLab logo to title page: {e}")
+                logger.warning(f"Warning: Could not add UniTyLab logo to title page: {e}")
         
         if logo_table:
             logo_table.setStyle(TableStyle([
@@ -5,6 +5,10 @@ Table of Contents generator for HHN PDF
 from reportlab.platypus import Paragraph, Spacer
 from reportlab.lib.units import cm
 from ..utils.text_utils import create_anchor_name
+from ..utils.inline_markdown import escape_markup
+from ..utils.console import get_logger
+
+logger = get_logger(__name__)
 
 
 class TOCGenerator:
@@ -13,10 +17,10 @@ class TOCGenerator:
     def __init__(self, toc_items, document_info):
         self.toc_items = toc_items
         self.document_info = document_info
-        self.actual_page_numbers = {}  # Will store actual page numbers from first pass
+        self.actual_page_numbers = {}  # Will store page numbers tracked by the previous pass
 
     def set_actual_page_numbers(self, page_numbers):
-        """Set the actual page numbers determined during first PDF pass"""
+        """Set the page numbers tracked during the previous layout pass"""
         self.actual_page_numbers = page_numbers
 
     def create_table_of_contents(self, styles, use_actual_pages=False):
@@ -28,8 +32,11 @@ class TOCGenerator:
         story.append(Paragraph("Table of Contents", styles['ThesisTitle']))
         story.append(Spacer(1, 1*cm))
 
-        if use_actual_pages and self.actual_page_numbers:
-            print("  ↳ Creating TOC with actual page numbers")
+        if use_actual_pages:
+            if self.actual_page_numbers:
+                logger.info("  ↳ Creating TOC with actual page numbers")
+            else:
+                logger.info("  ↳ Creating TOC with provisional page numbers")
             # Add TOC entries with page numbers
             for item in self.toc_items:
                 level = item['level']
@@ -40,14 +47,14 @@ class TOCGenerator:
                     continue
 
                 # Create anchor name for linking
-                anchor_name = create_anchor_name(text)
+                anchor_name = item.get('anchor') or create_anchor_name(text)
 
-                # Get actual page number from first pass
+                # Get page number tracked by the previous pass (1 until known)
                 page_num = self.actual_page_numbers.get(anchor_name, 1)
 
                 # Create TOC entry with page number and link
                 indent = "  " * max(0, level - 1)
-                text_part = f'{indent}<a href="#{anchor_name}" color="blue">{text}</a>'
+                text_part = f'{indent}<a href="#{anchor_name}" color="blue">{escape_markup(text)}</a>'
                 page_part = f'<b>{page_num}</b>'
 
                 # Dot leader approach
@@ -58,7 +65,7 @@ class TOCGenerator:
                 style_name = f'TOCEntry{min(level, 6)}'
                 story.append(Paragraph(toc_text, styles.get(style_name, styles['Normal'])))
         else:
-            print("  ↳ Creating TOC without page numbers (first pass)")
+            logger.info("  ↳ Creating TOC without page numbers (first pass)")
             # Add TOC entries without page numbers
             for item in self.toc_items:
                 level = item['level']
@@ -69,11 +76,11 @@ class TOCGenerator:
                     continue
 
                 # Create anchor name for linking
-                anchor_name = create_anchor_name(text)
+                anchor_name = item.get('anchor') or create_anchor_name(text)
 
                 # Create TOC entry without page number
                 indent = "  " * max(0, level - 1)
-                toc_text = f'{indent}<a href="#{anchor_name}" color="blue">{text}</a>'
+                toc_text = f'{indent}<a href="#{anchor_name}" color="blue">{escape_markup(text)}</a>'
 
                 # Use appropriate style
                 style_name = f'TOCEntry{min(level, 6)}'
@@ -4,13 +4,22 @@ HHN PDF Generator - Main CLI Entry Point
 Universal Heilbronn University Markdown to PDF Converter
 
 Usage:
-    python main.py input.md [-o output.pdf]
+    python main.py input.md [-o output.pdf] [--watch] [--profile fast|small|archive]
+    python main.py docs/ more/*.md [-o output_dir] [--jobs N]
+    python main.py input.md --metrics metrics.json [--quiet]
+    python main.py input.md --profile-cpu out.pstats [--profile-mem]
 """
 
+import os
 import sys
+import time
 import argparse
+import contextlib
 
-from hhn_pdf_generator import UniversalMarkdownToPDF
+from hhn_pdf_generator.utils.console import get_logger, setup_console
+
+# Named explicitly: run with -m, this module is __main__
+logger = get_logger('hhn_pdf_generator.main')
 
 
 def main():
@@ -23,27 +32,130 @@ Examples:
   python main.py proposal.md                    # Output: ./Output/HHN_proposal.pdf
   python main.py report.md -o custom_report.pdf # Output: ./Output/custom_report.pdf
   python main.py thesis.md -o /full/path/thesis.pdf # Output: /full/path/thesis.pdf
+  python main.py thesis.md --watch              # Rebuild on every save
+  python main.py thesis.md --profile small      # Smaller PDF for sending by mail
+  python main.py . --jobs 8                     # All *.md in the folder, 8 worker processes
+  python main.py . --job-timeout 60 --max-rss 1024 # Kill runaway documents
+  python main.py "cohort/*.md" -o /full/path/pdfs # Batch output directory
+  python main.py thesis.md --metrics m.json -q  # Phase timings as JSON, no progress output
+  python main.py thesis.md --profile-cpu t.pstats --profile-mem # Where time and memory go
         '''
     )
     
-    parser.add_argument('input', help='Input markdown file')
-    parser.add_argument('-o', '--output', help='Output PDF file (default: Output/HHN_[filename].pdf)')
+    parser.add_argument('input', nargs='+', help='Input markdown file(s), directories or glob patterns')
+    parser.add_argument('-o', '--output', help='Output PDF file (default: Output/HHN_[filename].pdf); output directory in batch mode')
+    parser.add_argument('-j', '--jobs', type=int, help='Batch mode: number of worker processes (default: CPU count)')
+    parser.add_argument('--job-timeout', type=float, metavar='SECONDS',
+                        help='Batch mode: kill a document after this many seconds (default: 300, 0: no limit)')
+    parser.add_argument('--max-rss', type=float, metavar='MB',
+                        help='Batch mode: kill a document whose worker uses more memory (default: 2048, 0: no limit)')
+    parser.add_argument('--max-jobs-per-worker', type=int, metavar='N',
+                        help='Batch mode: replace each worker process after N documents (default: 200, 0: never)')
+    parser.add_argument('--no-cache', action='store_true', help='Always render, even if the document is unchanged')
+    parser.add_argument('-w', '--watch', action='store_true', help='Keep running and rebuild the PDF whenever the input file changes')
+    parser.add_argument('-p', '--profile', choices=['fast', 'small', 'archive'],
+                        help='Output profile: fast (quick drafts), small (compact, screen resolution images) '
+                             'or archive (print resolution, lossless screenshots)')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='Write phase timings (wall and CPU time) and page, flowable and heading counts as JSON')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only print warnings, errors and the batch summary')
+    parser.add_argument('--profile-cpu', metavar='FILE',
+                        help='Profile the render with cProfile and write the stats to FILE (pstats format); '
+                             'directory with one FILE per document in batch mode')
+    parser.add_argument('--profile-mem', action='store_true',
+                        help='Trace memory with tracemalloc; print the top allocation sites after parsing and after '
+                             'every layout pass, and the peak')
     
     args = parser.parse_args()
+    setup_console()
+    
+    # Heavy imports only after argument parsing (keeps --help and usage errors fast)
+    from hhn_pdf_generator import UniversalMarkdownToPDF, generate_many
+    from hhn_pdf_generator.core.batch import collect_inputs, print_batch_summary, batch_metrics_report
+    from hhn_pdf_generator.core.config import Config
+    from hhn_pdf_generator.core.metrics import MetricsCollector, write_metrics
+    from hhn_pdf_generator.core.profiling import RenderProfiler, print_memory_report
+    from hhn_pdf_generator.utils.console import set_quiet
+    
+    if args.quiet:
+        set_quiet()
+    if args.profile:
+        Config.apply_profile(args.profile)
+    
+    # A profile of an output cache hit would show nothing, so profiled documents are always rendered
+    profiling = bool(args.profile_cpu or args.profile_mem)
+    use_cache = not (args.no_cache or profiling)
+    
+    inputs = collect_inputs(args.input)
+    batch_mode = args.jobs is not None or len(inputs) != 1 or os.path.isdir(args.input[0])
     
-    print("============================================================")
-    print("🏛️  UNIVERSAL HHN MARKDOWN TO PDF CONVERTER v2.0")
-    print("============================================================")
+    logger.info("============================================================")
+    logger.info("🏛️  UNIVERSAL HHN MARKDOWN TO PDF CONVERTER v2.0")
+    logger.info("============================================================")
     
     if not args.output:
-        print("📁 Output directory: ./Output/")
+        logger.info("📁 Output directory: ./Output/")
     
+    if batch_mode:
+        if args.watch:
+            logger.error("❌ Error: --watch needs a single input file")
+            sys.exit(1)
+        
+        if not inputs:
+            logger.error("❌ Error: No markdown files found")
+            sys.exit(1)
+        
+        logger.info(f"📚 Batch converting {len(inputs)} file(s)...")
+        start = time.perf_counter()
+        try:
+            results = generate_many(
+                inputs, jobs=args.jobs, output_dir=args.output, use_cache=use_cache, profile=args.profile,
+                job_timeout=args.job_timeout, max_rss_mb=args.max_rss, max_jobs_per_worker=args.max_jobs_per_worker,
+                cpu_profile_dir=args.profile_cpu, profile_memory=args.profile_mem
+            )
+        except ValueError as e:
+            logger.error(f"❌ Error: {e}")
+            sys.exit(1)
+        wall_seconds = time.perf_counter() - start
+        print_batch_summary(results, wall_seconds)
+        for result in results:
+            if result['memory']:
+                print_memory_report(result['memory'], os.path.basename(result['input']))
+        if args.profile_cpu:
+            logger.info(f"🔬 CPU profiles written to {args.profile_cpu}/ (view with: python -m pstats FILE)")
+        if args.metrics:
+            write_metrics(args.metrics, batch_metrics_report(results, wall_seconds))
+            logger.info(f"📈 Metrics written to {args.metrics}")
+        if any(result['error'] for result in results):
+            sys.exit(1)
+        return
+    
+    if args.watch:
+        if args.metrics or profiling:
+            logger.error("❌ Error: --metrics, --profile-cpu and --profile-mem can't be combined with --watch")
+            sys.exit(1)
+        from hhn_pdf_generator.core.watcher import DocumentWatcher
+        DocumentWatcher(inputs[0], args.output, use_cache=use_cache).run()
+        return
+    
+    profiler = RenderProfiler(args.profile_cpu, args.profile_mem) if profiling else None
     try:
-        converter = UniversalMarkdownToPDF(args.input)
-        converter.generate_pdf(args.input, args.output)
+        converter = UniversalMarkdownToPDF(inputs[0])
+        metrics = MetricsCollector()
+        with profiler.capture(metrics) if profiler else contextlib.nullcontext():
+            output_file = converter.generate_pdf(inputs[0], args.output, use_cache=use_cache, metrics=metrics)
     except Exception as e:
-        print(f"❌ Error: {e}")
+        logger.error(f"❌ Error: {e}")
         sys.exit(1)
+    
+    if args.profile_cpu:
+        logger.info(f"🔬 CPU profile written to {args.profile_cpu} (view with: python -m pstats {args.profile_cpu})")
+    if args.profile_mem:
+        print_memory_report(profiler.memory_report())
+    
+    if args.metrics:
+        write_metrics(args.metrics, {'input': inputs[0], 'output': output_file, **converter.metrics.report()})
+        logger.info(f"📈 Metrics written to {args.metrics}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,375 @@
+"""
+Local render server for HHN PDF Generator
+
+Keeps worker processes warm between requests: modules are imported, logos
+fetched and the stylesheet built once per worker, not once per document.
+
+Usage:
+    python -m hhn_pdf_generator.server [--port 8765 | --socket PATH] [--workers N] [--profile small]
+
+Endpoints:
+    POST /render   markdown as the request body, or JSON {"markdown": ...,
+                   "front_matter": {...}} whose front matter sections override
+                   those of the document; returns application/pdf
+    GET  /metrics  JSON with queue depth, in-flight jobs, latency percentiles,
+                   killed jobs by reason and recycled workers
+
+A render that exceeds the job timeout or memory cap is killed with its
+worker and answered with 504 (timeout) or 500 and the reason in "killed".
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import socketserver
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .core.config import Config
+from .core.render import DocumentSpec, render
+from .core.styles import StyleManager
+from .core.worker_pool import WorkerPool, JobKilledError
+from .utils.logo_handler import LogoHandler
+from .utils.console import set_quiet, setup_console
+
+
+# Per-process state of a warm render worker
+_worker_logo_handler = None
+_worker_style_manager = None
+
+# Rendered once by every worker on start so that the first request does not
+# pay for lazy imports (yaml, Pygments), font metrics and the stylesheet
+_WARM_UP_FRONT_MATTER = {
+    'student': dict.fromkeys(Config.REQUIRED_STUDENT_FIELDS, '-'),
+    'document': dict.fromkeys(Config.REQUIRED_DOC_FIELDS, '-'),
+    'university': dict.fromkeys(Config.REQUIRED_UNI_FIELDS, '-'),
+}
+_WARM_UP_MARKDOWN = """# Warm-up
+
+Text with **bold**, *italic* and `code`.
+
+- Item
+
+| Column | Value |
+|--------|------:|
+| a      | 1     |
+
+```python
+def warm_up():
+    return 1
+```
+"""
+
+
+def _init_worker(hhn_logo_path, unitylab_logo_path, profile=None):
+    """Load everything a render needs, then render a small document once"""
+    global _worker_logo_handler, _worker_style_manager
+    set_quiet()  # Progress output of jobs is discarded, skip formatting it
+    if profile:
+        Config.apply_profile(profile)
+    _worker_logo_handler = LogoHandler(hhn_logo_path, unitylab_logo_path)
+    _worker_style_manager = StyleManager()
+    _render_job(_WARM_UP_MARKDOWN, _WARM_UP_FRONT_MATTER, use_cache=False)
+
+
+def _render_job(markdown_text, front_matter=None, use_cache=True):
+    """Render one document in a worker and return the PDF bytes"""
+    spec = DocumentSpec(
+        markdown_text,
+        front_matter,
+        hhn_logo_path=_worker_logo_handler.hhn_logo_path,
+        unitylab_logo_path=_worker_logo_handler.unitylab_logo_path,
+        use_cache=use_cache
+    )
+    return render(spec, _worker_style_manager.get_styles()).pdf_bytes
+
+
+def merge_front_matter(markdown_text, overrides):
+    """Apply front matter overrides to a document
+
+    Returns (markdown body, front matter dict). Sections of overrides that
+    are dicts update the document's section of the same name field by field;
+    other values replace it. Without overrides the text is returned as is
+    with None, so that the generator parses its front matter.
+    """
+    if not overrides:
+        return markdown_text, None
+    if not isinstance(overrides, dict):
+        raise ValueError("front_matter must be a JSON object")
+
+    import yaml
+
+    front_matter = {}
+    body = markdown_text
+    lines = markdown_text.split('\n')
+    if lines and lines[0].strip() == '---':
+        for index, line in enumerate(lines[1:], 1):
+            if line.strip() == '---':
+                try:
+                    front_matter = yaml.safe_load('\n'.join(lines[1:index])) or {}
+                except yaml.YAMLError as e:
+                    raise ValueError(f"Error parsing YAML front matter: {e}")
+                body = '\n'.join(lines[index + 1:])
+                break
+    if not isinstance(front_matter, dict):
+        raise ValueError("YAML front matter must be a mapping")
+
+    for section, values in overrides.items():
+        if isinstance(values, dict) and isinstance(front_matter.get(section), dict):
+            front_matter[section] = {**front_matter[section], **values}
+        else:
+            front_matter[section] = values
+    return body, front_matter
+
+
+class RenderMetrics:
+    """Thread-safe counters and a window of recent render latencies"""
+
+    def __init__(self, window=None):
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.killed = {}
+        self.latencies = deque(maxlen=window or Config.SERVER_LATENCY_WINDOW)
+
+    def start(self):
+        with self.lock:
+            self.pending += 1
+
+    def finish(self, seconds, ok=True, killed=None):
+        """Count a finished render; killed is the JobKilledError reason, if any"""
+        with self.lock:
+            self.pending -= 1
+            if ok:
+                self.completed += 1
+                self.latencies.append(seconds)
+            else:
+                self.failed += 1
+            if killed:
+                self.killed[killed] = self.killed.get(killed, 0) + 1
+
+    def snapshot(self, workers, recycled=0):
+        """Metrics as a JSON-ready dict; jobs beyond the worker count are queued"""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            pending, completed, failed = self.pending, self.completed, self.failed
+            killed = dict(self.killed)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(p / 100.0 * len(latencies)))
+            return round(latencies[index] * 1000, 1)
+
+        return {
+            'workers': workers,
+            'queue_depth': max(0, pending - workers),
+            'in_flight': min(pending, workers),
+            'completed': completed,
+            'failed': failed,
+            'killed': killed,
+            'recycled_workers': recycled,
+            'latency_ms': {'p50': percentile(50), 'p95': percentile(95), 'p99': percentile(99)},
+        }
+
+
+class RenderService:
+    """Pool of warm worker processes rendering markdown into PDF bytes
+
+    job_timeout, max_rss_mb and max_jobs_per_worker are the limits of the
+    WorkerPool (default: Config.WORKER_*, 0: no limit). A replacement worker
+    warms up before it takes requests.
+    """
+
+    def __init__(self, workers=None, profile=None, use_cache=True,
+                 job_timeout=None, max_rss_mb=None, max_jobs_per_worker=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.profile = profile
+        self.use_cache = use_cache
+        self.limits = {'job_timeout': job_timeout, 'max_rss_mb': max_rss_mb, 'max_jobs_per_worker': max_jobs_per_worker}
+        self.metrics = RenderMetrics()
+        self.logo_handler = LogoHandler()
+        self.pool = None
+
+    def start(self):
+        """Fetch the logos once and start all workers; returns when they are warm"""
+        self.logo_handler.download_logos()
+        self.pool = WorkerPool(
+            self.workers,
+            _init_worker,
+            (self.logo_handler.hhn_logo_path, self.logo_handler.unitylab_logo_path, self.profile),
+            **self.limits
+        )
+        self.pool.wait_ready()
+
+    def render(self, markdown_text, front_matter=None):
+        """Render a document in a worker (blocking) and return the PDF bytes
+
+        Raises JobKilledError if the render was killed for exceeding a limit.
+        """
+        body, front_matter = merge_front_matter(markdown_text, front_matter)
+        self.metrics.start()
+        start = time.perf_counter()
+        ok = False
+        killed = None
+        try:
+            pdf_bytes = self.pool.submit(_render_job, body, front_matter, self.use_cache).result()
+            ok = True
+            return pdf_bytes
+        except JobKilledError as e:
+            killed = e.reason
+            raise
+        finally:
+            self.metrics.finish(time.perf_counter() - start, ok, killed)
+
+    def snapshot(self):
+        """Metrics of /metrics"""
+        return self.metrics.snapshot(self.workers, self.pool.recycled if self.pool else 0)
+
+    def close(self):
+        if self.pool:
+            self.pool.close(kill=True)
+            self.pool = None
+        self.logo_handler.cleanup_logos()
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of the RenderService in self.server.service"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send_json(200, self.server.service.snapshot())
+        else:
+            self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/render':
+            self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            if self.headers.get('Content-Length') is None:
+                self.close_connection = True
+                self._send_json(411, {'error': "Content-Length required"})
+                return
+            try:
+                length = int(self.headers['Content-Length'])
+            except ValueError:
+                length = -1
+            if length < 0:
+                # Where the body ends is unknown, so the connection can't be reused
+                self.close_connection = True
+                self._send_json(400, {'error': f"Invalid Content-Length: {self.headers['Content-Length']}"})
+                return
+            if length > Config.SERVER_MAX_REQUEST_BYTES:
+                self.close_connection = True
+                self._send_json(413, {'error': f"Request larger than {Config.SERVER_MAX_REQUEST_BYTES} bytes"})
+                return
+
+            data = self.rfile.read(length)
+            if len(data) != length:
+                self.close_connection = True
+                self._send_json(400, {'error': f"Request body ended after {len(data)} of {length} bytes"})
+                return
+            body = data.decode('utf-8')
+            front_matter = None
+            if self.headers.get_content_type() == 'application/json':
+                request = json.loads(body)
+                body = request['markdown']
+                front_matter = request.get('front_matter')
+            pdf_bytes = self.server.service.render(body, front_matter)
+        except (ValueError, KeyError, TypeError) as e:
+            # Invalid JSON or UTF-8, missing markdown, bad front matter
+            self._send_json(400, {'error': str(e) if not isinstance(e, KeyError) else f"Missing field: {e}"})
+            return
+        except JobKilledError as e:
+            self._send_json(504 if e.reason == 'timeout' else 500, {'error': str(e), 'killed': e.reason})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(pdf_bytes)))
+        self.end_headers()
+        self.wfile.write(pdf_bytes)
+
+    def _send_json(self, status, data):
+        payload = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP on a Unix domain socket, one thread per connection"""
+
+    daemon_threads = True
+
+
+def create_server(service, host=None, port=None, socket_path=None):
+    """HTTP server for service on a Unix socket or on host:port"""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # Left over from a previous run
+        server = ThreadingUnixHTTPServer(socket_path, RenderRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host or Config.SERVER_HOST, port or Config.SERVER_PORT), RenderRequestHandler)
+    server.service = service
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local HHN PDF render server with warm workers')
+    parser.add_argument('--host', default=Config.SERVER_HOST, help=f'Address to listen on (default: {Config.SERVER_HOST})')
+    parser.add_argument('--port', type=int, default=Config.SERVER_PORT, help=f'Port to listen on (default: {Config.SERVER_PORT})')
+    parser.add_argument('--socket', help='Listen on this Unix socket instead of TCP')
+    parser.add_argument('-j', '--workers', type=int, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('-p', '--profile', choices=sorted(Config.OUTPUT_PROFILES), help='Output profile of all renders')
+    parser.add_argument('--job-timeout', type=float, metavar='SECONDS',
+                        help=f'Kill a render after this many seconds (default: {Config.WORKER_JOB_TIMEOUT}, 0: no limit)')
+    parser.add_argument('--max-rss', type=float, metavar='MB',
+                        help=f'Kill a render whose worker uses more memory (default: {Config.WORKER_MAX_RSS_MB}, 0: no limit)')
+    parser.add_argument('--max-jobs-per-worker', type=int, metavar='N',
+                        help=f'Replace each worker after N renders (default: {Config.WORKER_MAX_JOBS}, 0: never)')
+    parser.add_argument('--no-cache', action='store_true', help='Always render, even if the document is unchanged')
+    args = parser.parse_args()
+    setup_console()
+
+    service = RenderService(
+        args.workers, args.profile, use_cache=not args.no_cache,
+        job_timeout=args.job_timeout, max_rss_mb=args.max_rss, max_jobs_per_worker=args.max_jobs_per_worker
+    )
+    print(f"🔥 Starting {service.workers} warm worker(s)...")
+    service.start()
+
+    server = create_server(service, args.host, args.port, args.socket)
+    where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"🚀 Serving on {where} (POST /render, GET /metrics, Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
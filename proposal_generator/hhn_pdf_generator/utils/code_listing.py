@@ -0,0 +1,119 @@
+"""
+Line-oriented flowable for code blocks
+"""
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus.flowables import Flowable
+
+
+class CodeListing(Flowable):
+    """Code block drawn line by line, bypassing the paragraph markup parser
+
+    Text is drawn exactly as written (no markup, so nothing needs escaping)
+    in the monospaced font of the style, on the style's background color with
+    borderPadding around it. Lines are strings, or lists of (text, rgb)
+    runs for highlighted code (rgb None: the style's text color). Lines
+    wider than the frame are broken where the next character no longer fits.
+    Splitting only slices the display lines, so layout time grows linearly
+    with the length of the listing.
+    """
+
+    # Never leave fewer lines than this at the bottom or top of a page
+    MIN_SPLIT_LINES = 2
+
+    def __init__(self, lines, style, wrap_width=None, start=0, end=None):
+        Flowable.__init__(self)
+        self.lines = lines
+        self.style = style
+        self.wrap_width = wrap_width  # Width self.lines are broken for, None: source lines
+        self.start = start
+        self.end = len(lines) if end is None else end
+
+    def _padding(self):
+        return self.style.borderPadding or 0
+
+    def _break_lines(self, lines, width):
+        """Expand tabs and break lines that do not fit into width"""
+        style = self.style
+        char_width = stringWidth('M', style.fontName, style.fontSize)
+        max_chars = max(1, int((width - 2*self._padding() - style.leftIndent) / char_width))
+
+        display_lines = []
+        for line in lines:
+            if not isinstance(line, str):
+                display_lines.extend(self._break_runs(line, max_chars))
+                continue
+            line = line.expandtabs(4)
+            if len(line) <= max_chars:
+                display_lines.append(line)
+            else:
+                display_lines.extend(line[i:i + max_chars] for i in range(0, len(line), max_chars))
+        return display_lines
+
+    def _break_runs(self, runs, max_chars):
+        """Break a line of (text, color) runs into lines of at most max_chars"""
+        lines = [[]]
+        room = max_chars
+        for text, color in runs:
+            while len(text) > room:
+                if room:
+                    lines[-1].append((text[:room], color))
+                    text = text[room:]
+                lines.append([])
+                room = max_chars
+            if text:
+                lines[-1].append((text, color))
+                room -= len(text)
+        return lines
+
+    def wrap(self, availWidth, availHeight):
+        if self.wrap_width != availWidth:
+            self.lines = self._break_lines(self.lines[self.start:self.end], availWidth)
+            self.wrap_width = availWidth
+            self.start, self.end = 0, len(self.lines)
+
+        self.width = availWidth
+        self.height = (self.end - self.start) * self.style.leading + 2*self._padding()
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        self.wrap(availWidth, availHeight)
+        count = self.end - self.start
+        fitting = int((availHeight - 2*self._padding()) / self.style.leading)
+        fitting = min(fitting, count - self.MIN_SPLIT_LINES)
+        if fitting < self.MIN_SPLIT_LINES:
+            return []
+
+        middle = self.start + fitting
+        return [
+            CodeListing(self.lines, self.style, availWidth, self.start, middle),
+            CodeListing(self.lines, self.style, availWidth, middle, self.end),
+        ]
+
+    def draw(self):
+        canvas = self.canv
+        style = self.style
+        padding = self._padding()
+
+        if style.backColor:
+            canvas.setFillColor(style.backColor)
+            canvas.rect(0, 0, self.width, self.height, stroke=0, fill=1)
+
+        canvas.setFillColor(style.textColor)
+        text = canvas.beginText(padding + style.leftIndent, self.height - padding - style.fontSize)
+        text.setFont(style.fontName, style.fontSize, style.leading)
+        default_color = current_color = style.textColor.rgb()
+        for index in range(self.start, self.end):
+            line = self.lines[index]
+            if isinstance(line, str):
+                text.textLine(line)
+                continue
+
+            for run, color in line:
+                color = color or default_color
+                if color is not current_color:
+                    text.setFillColor(color)
+                    current_color = color
+                text.textOut(run)
+            text.textLine()
+        canvas.drawText(text)
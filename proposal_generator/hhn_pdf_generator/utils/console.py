@@ -0,0 +1,56 @@
+"""
+Console output of HHN PDF Generator
+
+Progress messages and warnings go through the loggers below
+'hhn_pdf_generator'. As a library the package only attaches a NullHandler,
+so records propagate to whatever logging the embedding application
+configures. The command line tools call setup_console(), which prints them
+to stdout as plain lines, exactly like print(); quiet mode keeps only
+warnings and errors and so skips formatting and console I/O of all progress
+messages. Modules get their logger from get_logger(), so that importing the
+package alone doesn't load logging.
+"""
+
+import sys
+import logging
+
+LOGGER_NAME = 'hhn_pdf_generator'
+
+
+class ConsoleHandler(logging.Handler):
+    """Writes plain messages to the current sys.stdout
+
+    Looks up sys.stdout on every message, so that contextlib.redirect_stdout
+    captures the output like it captured print().
+    """
+
+    def emit(self, record):
+        try:
+            sys.stdout.write(self.format(record) + '\n')
+        except Exception:
+            self.handleError(record)
+
+
+def setup_console():
+    """Print the package's messages to stdout (command line tools only)
+
+    Does nothing if the application already gave the logger a handler.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    if not any(not isinstance(handler, logging.NullHandler) for handler in logger.handlers):
+        logger.addHandler(ConsoleHandler())
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def get_logger(name):
+    """logging.getLogger(name) of a module; the package logger gets a NullHandler"""
+    package_logger = logging.getLogger(LOGGER_NAME)
+    if not package_logger.handlers:
+        package_logger.addHandler(logging.NullHandler())
+    return logging.getLogger(name)
+
+
+def set_quiet(quiet=True):
+    """Only show warnings and errors (quiet) or all progress messages"""
+    logging.getLogger(LOGGER_NAME).setLevel(logging.WARNING if quiet else logging.INFO)
@@ -0,0 +1,40 @@
+"""
+File utility functions
+"""
+
+import os
+import threading
+
+
+def read_lines(path):
+    """Stream the lines of a UTF-8 text file
+    
+    The file is opened when the first line is requested and closed as soon
+    as the last one has been read, so it isn't held open while the parsed
+    document is laid out.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from f
+
+
+def write_file_atomic(path, data):
+    """Write bytes via a temporary file and rename it into place
+    
+    Readers never see partial content, and an existing file (which may be a
+    hard link into a cache) is replaced instead of truncated. The temporary
+    name is unique per thread, so concurrent writers of the same cache entry
+    never share a temporary file.
+    """
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def format_size(num_bytes):
+    """Human readable file size, e.g. '1.4 MB'"""
+    if num_bytes < 1024:
+        return f"{num_bytes} bytes"
+    if num_bytes < 1024 * 1024:
+        return f"{num_bytes / 1024:.1f} KB"
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
@@ -0,0 +1,130 @@
+"""
+Downscaling cache for images embedded in documents
+"""
+
+import os
+import hashlib
+from io import BytesIO
+from ..core.config import Config
+from .file_utils import write_file_atomic
+from .console import get_logger
+
+logger = get_logger(__name__)
+
+
+# Content digests and fitted images of this process, keyed with the file's
+# mtime and size so that edited images are picked up
+_file_digests = {}
+_fitted_images = {}
+_reused_paths = {}  # First path seen per content digest, see Config.IMAGE_REUSE
+
+# Assumed resolution of images without DPI information (screenshots)
+_SCREEN_DPI = 96
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file, computed once per file version"""
+    stat = os.stat(path)
+    state = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_digests.get(path)
+    if cached is not None and cached[0] == state:
+        return cached[1]
+
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(chunk)
+    digest = hasher.hexdigest()
+    _file_digests[path] = (state, digest)
+    return digest
+
+
+def fit_image(path, max_width, max_height):
+    """Fit an image into max_width x max_height points
+
+    Returns (path, width, height): the file to embed and its display size.
+    Images keep their natural size (from their DPI, 96 if unknown) unless
+    that is larger than the box. Images with more pixels than needed for
+    the display size at Config.IMAGE_DPI are downscaled and recompressed
+    (in Config.IMAGE_FORMAT) into the image cache, keyed by the file's hash
+    and the target size. With Config.IMAGE_REUSE, content-identical files
+    all return the same path. Raises OSError for missing or unreadable images.
+    """
+    stat = os.stat(path)
+    key = (
+        path, stat.st_mtime_ns, stat.st_size, max_width, max_height,
+        Config.IMAGE_DPI, Config.IMAGE_JPEG_QUALITY, Config.IMAGE_FORMAT, Config.IMAGE_REUSE
+    )
+    fitted = _fitted_images.get(key)
+    if fitted is None:
+        fitted = _fit_image(path, max_width, max_height)
+        if Config.IMAGE_REUSE:
+            reused_path = _reused_paths.setdefault(file_digest(fitted[0]), fitted[0])
+            fitted = (reused_path,) + fitted[1:]
+        _fitted_images[key] = fitted
+    return fitted
+
+
+def _fit_image(path, max_width, max_height):
+    from PIL import Image as PILImage, ImageOps
+
+    with PILImage.open(path) as img:
+        orientation = img.getexif().get(0x0112, 1)  # EXIF orientation tag
+        rotated = orientation in (5, 6, 7, 8)
+        pixel_width, pixel_height = img.size
+        if rotated:
+            pixel_width, pixel_height = pixel_height, pixel_width
+
+        dpi = img.info.get('dpi', (_SCREEN_DPI, _SCREEN_DPI))[0] or _SCREEN_DPI
+        width = pixel_width * 72.0 / dpi
+        height = pixel_height * 72.0 / dpi
+        scale = min(1.0, max_width / width, max_height / height)
+        width *= scale
+        height *= scale
+
+        target = (
+            max(1, round(width / 72.0 * Config.IMAGE_DPI)),
+            max(1, round(height / 72.0 * Config.IMAGE_DPI)),
+        )
+        transparent = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+        if img.format == 'JPEG' or (Config.IMAGE_FORMAT == 'JPEG' and not transparent):
+            image_format = 'JPEG'
+        else:
+            image_format = 'PNG'
+        if target[0] >= pixel_width and orientation == 1 and (
+                Config.IMAGE_FORMAT is None or image_format == img.format):
+            return path, width, height  # Not more pixels than needed
+
+        target = (min(target[0], pixel_width), min(target[1], pixel_height))
+        key = hashlib.sha256(
+            f"{file_digest(path)}\0{target[0]}x{target[1]}\0{image_format}\0"
+            f"{Config.IMAGE_JPEG_QUALITY}".encode('utf-8')
+        ).hexdigest()
+        cached_path = os.path.join(
+            Config.IMAGE_CACHE_DIR, key[:2], f"{key}.{image_format.lower().replace('jpeg', 'jpg')}"
+        )
+        if os.path.exists(cached_path):
+            return cached_path, width, height
+
+        # JPEG: decode at a reduced scale right away (size before rotation)
+        img.draft(img.mode, target[::-1] if rotated else target)
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ('P', '1'):
+            img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+        img = img.resize(target, PILImage.LANCZOS, reducing_gap=3.0)
+
+    buffer = BytesIO()
+    if image_format == 'JPEG':
+        if img.mode not in ('RGB', 'L', 'CMYK'):
+            img = img.convert('RGB')
+        img.save(buffer, 'JPEG', quality=Config.IMAGE_JPEG_QUALITY, optimize=True)
+    else:
+        img.save(buffer, 'PNG', optimize=True)
+
+    try:
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        write_file_atomic(cached_path, buffer.getvalue())
+    except OSError as e:
+        logger.warning(f"⚠ Warning: Could not store downscaled image in image cache: {e}")
+        return path, width, height
+    return cached_path, width, height
@@ -0,0 +1,150 @@
+"""
+Inline markdown formatting for ReportLab paragraph markup
+"""
+
+import re
+from reportlab.platypus.paraparser import known_entities
+
+# Entity references are kept if ReportLab's paragraph parser knows them, and
+# numeric ones if they name a valid code point
+_ENTITY = re.compile(r'&(#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);')
+_AUTOLINK = re.compile(r'<([A-Za-z][A-Za-z0-9+.-]*:[^\s<>]+)>')
+_URL_SCHEME = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*:')
+_SPECIAL = re.compile(r'[\\`*\[<&>]')
+_PUNCTUATION = frozenset('!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~')
+_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;'}
+_EMPHASIS_TAGS = {'**': ('<b>', '</b>'), '*': ('<i>', '</i>')}
+
+
+def escape_markup(text):
+    """Escape &, < and > for use in paragraph markup"""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _valid_code_point(reference):
+    """Whether a numeric reference (#65, #x41) names a character chr() accepts"""
+    value = int(reference[2:], 16) if reference[1] in 'xX' else int(reference[1:])
+    return 0 < value <= 0x10FFFF
+
+
+def _link(url, label_markup):
+    """Hyperlink markup; targets without a URL scheme (relative files, #anchors)
+    cannot be resolved in the PDF and keep only their label"""
+    if not _URL_SCHEME.match(url):
+        return label_markup
+    href = escape_markup(url).replace('"', '&quot;')
+    return f'<a href="{href}" color="blue">{label_markup}</a>'
+
+
+def format_inline(text):
+    """Convert inline markdown into ReportLab paragraph markup in one scan
+
+    Handles **bold**, *italic*, `code` spans, [links](url), <url> autolinks,
+    backslash escapes and escaping of &, < and >. Code span contents are
+    copied verbatim, markers without a partner stay literal text and the
+    emitted tags are always properly nested.
+    """
+    out = []
+    openers = []  # Unclosed emphasis as (marker, index of its placeholder in out)
+    n = len(text)
+    i = 0
+
+    # Next '](' after the current position (n: none left) and the last '['
+    # before it, the only one that can open a link; both are searched once
+    # per '](' so that unmatched brackets cannot make the scan quadratic
+    link_close = link_open = -1
+    unmatched_runs = set()  # Backtick run lengths without a closing run
+
+    while i < n:
+        char = text[i]
+
+        if char == '\\' and i + 1 < n and text[i + 1] in _PUNCTUATION:
+            out.append(_ESCAPES.get(text[i + 1], text[i + 1]))
+            i += 2
+
+        elif char == '`':
+            # A code span ends at the next run of the same number of backticks
+            run = 1
+            while i + run < n and text[i + run] == '`':
+                run += 1
+            end = -1 if run in unmatched_runs else text.find('`' * run, i + run)
+            if end < 0:
+                unmatched_runs.add(run)
+                out.append(text[i:i + run])
+            else:
+                code = text[i + run:end]
+                if len(code) > 2 and code[0] == ' ' and code[-1] == ' ':
+                    code = code[1:-1]
+                out.append(f'<font name="Courier">{escape_markup(code)}</font>')
+                run = end + run - i
+            i += run
+
+        elif char == '*':
+            run = 1
+            while i + run < n and text[i + run] == '*':
+                run += 1
+            can_close = i > 0 and not text[i - 1].isspace()
+            can_open = i + run < n and not text[i + run].isspace()
+
+            if can_close and openers and len(openers[-1][0]) <= run:
+                marker, index = openers.pop()
+                open_tag, close_tag = _EMPHASIS_TAGS[marker]
+                out[index] = open_tag
+                out.append(close_tag)
+                i += len(marker)
+            elif can_open:
+                marker = '**' if run >= 2 else '*'
+                openers.append((marker, len(out)))
+                out.append(marker)  # Stays literal unless closed
+                i += len(marker)
+            else:
+                out.append(text[i:i + run])
+                i += run
+
+        elif char == '[':
+            if link_close < i:
+                link_close = text.find('](', i + 1)
+                if link_close < 0:
+                    link_close = n
+                link_open = text.rfind('[', i, link_close)
+            end = text.find(')', link_close + 2) if i == link_open else -1
+            if end < 0:
+                out.append('[')
+                i += 1
+            else:
+                target = text[link_close + 2:end].strip()
+                url = target.split()[0] if target else ''
+                out.append(_link(url, format_inline(text[i + 1:link_close])))
+                i = end + 1
+
+        elif char == '<':
+            match = _AUTOLINK.match(text, i)
+            if match:
+                out.append(_link(match.group(1), escape_markup(match.group(1))))
+                i = match.end()
+            else:
+                out.append('&lt;')
+                i += 1
+
+        elif char == '&':
+            match = _ENTITY.match(text, i)
+            name = match.group(1) if match else None
+            if name and (name in known_entities or (name[0] == '#' and _valid_code_point(name))):
+                out.append(match.group(0))
+                i = match.end()
+            else:
+                out.append('&amp;')
+                i += 1
+
+        elif char == '>':
+            out.append('&gt;')
+            i += 1
+
+        else:
+            # Copy plain text up to the next special character in one step
+            match = _SPECIAL.search(text, i + 1)
+            end = match.start() if match else n
+            out.append(text[i:end])
+            i = end
+
+    return ''.join(out)
@@ -3,62 +3,139 @@ Logo download and processing utilities
 """
 
 import os
-import requests
+import json
+import time
+import shutil
+import hashlib
 import tempfile
-from PIL import Image as PILImage
+from concurrent.futures import ThreadPoolExecutor
 from ..core.config import Config
+from .file_utils import write_file_atomic
+from .console import get_logger
+
+logger = get_logger(__name__)
 
 
 class LogoHandler:
-    """Handles logo download and processing"""
+    """Handles logo download and processing
+    
+    Logos are kept in a persistent, content-addressed cache directory together
+    with the processed UniTyLab logo. A cached logo is revalidated with
+    ETag/If-Modified-Since at most once per Config.LOGO_CACHE_TTL. When the
+    download fails the cached copy or the configured local file is used.
+    """
     
-    def __init__(self):
-        self.hhn_logo_path = None
-        self.unitylab_logo_path = None
+    def __init__(self, hhn_logo_path=None, unitylab_logo_path=None, cache_dir=None):
+        self.hhn_logo_path = hhn_logo_path
+        self.unitylab_logo_path = unitylab_logo_path
+        self.cache_dir = cache_dir or Config.LOGO_CACHE_DIR
+        self._temp_cache_dir = None
     
     def download_logos(self):
         """Download HHN and UniTyLab logos"""
-        print("Downloading logos...")
+        logger.info("Downloading logos...")
+        self._ensure_cache_dir()
+        
+        # Fetch both logos concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hhn_future = executor.submit(
+                self._fetch_logo, Config.HHN_LOGO_URL, '.jpg', Config.HHN_LOGO_PATH
+            )
+            unitylab_future = executor.submit(
+                self._fetch_logo, Config.UNITYLAB_LOGO_URL, '.png', Config.UNITYLAB_LOGO_PATH
+            )
         
-        # Download HHN logo
+        # HHN logo
         try:
-            response = requests.get(Config.HHN_LOGO_URL, timeout=10)
-            response.raise_for_status()
-            
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
-            temp_file.write(response.content)
-            temp_file.close()
-            self.hhn_logo_path = temp_file.name
-            print("✓ HHN logo downloaded")
+            self.hhn_logo_path, source = hhn_future.result()
+            logger.info(f"✓ HHN logo {source}")
             
         except Exception as e:
-            print(f"⚠ Warning: Could not download HHN logo: {e}")
+            logger.warning(f"⚠ Warning: Could not download HHN logo: {e}")
             self.hhn_logo_path = None
         
-        # Download UniTyLab logo
+        # UniTyLab logo
         try:
-            response = requests.get(Config.UNITYLAB_LOGO_URL, timeout=10)
-            response.raise_for_status()
-            
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            temp_file.write(response.content)
-            temp_file.close()
+            logo_path, source = unitylab_future.result()
             
             # Process the UniTyLab logo to add white background
-            self.unitylab_logo_path = self._process_unitylab_logo(temp_file.name)
-            
-            # Clean up original temp file
-            os.unlink(temp_file.name)
-            print("✓ UniTyLab logo downloaded and processed")
+            self.unitylab_logo_path = self._process_unitylab_logo(logo_path)
+            logger.info(f"✓ UniTyLab logo {source} and processed")
             
         except Exception as e:
-            print(f"⚠ Warning: Could not download UniTyLab logo: {e}")
-            print("  Creating text-based UniTyLab placeholder...")
+            logger.warning(f"⚠ Warning: Could not download UniTyLab logo: {e}")
+            logger.info("  Creating text-based UniTyLab placeholder...")
             self.unitylab_logo_path = None
     
+    def _fetch_logo(self, url, suffix, local_path=None):
+        """Return (path, source) of a logo from the cache, the network or local_path"""
+        url_key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        meta_path = os.path.join(self.cache_dir, f"{url_key}.json")
+        meta = self._read_meta(meta_path)
+        
+        cached_path = None
+        if meta.get('sha256'):
+            cached_path = os.path.join(self.cache_dir, meta['sha256'] + suffix)
+            if not os.path.exists(cached_path):
+                cached_path = None
+        
+        # Fresh cache entry: no network access at all
+        if cached_path and time.time() - meta.get('checked_at', 0) < Config.LOGO_CACHE_TTL:
+            return cached_path, "loaded from cache"
+        
+        headers = {}
+        if cached_path:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        
+        try:
+            # Imported only when a logo really has to be fetched
+            import requests
+            
+            response = requests.get(url, headers=headers, timeout=Config.LOGO_DOWNLOAD_TIMEOUT)
+            
+            if response.status_code == 304 and cached_path:
+                source = "revalidated from cache"
+            else:
+                response.raise_for_status()
+                
+                digest = hashlib.sha256(response.content).hexdigest()
+                cached_path = os.path.join(self.cache_dir, digest + suffix)
+                if not os.path.exists(cached_path):
+                    write_file_atomic(cached_path, response.content)
+                
+                meta = {
+                    'sha256': digest,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }
+                source = "downloaded"
+            
+            meta['checked_at'] = time.time()
+            write_file_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+            return cached_path, source
+            
+        except Exception as e:
+            # Offline fallback: stale cache first, then the configured local file
+            if cached_path:
+                return cached_path, f"loaded from cache (offline: {type(e).__name__})"
+            if local_path and os.path.exists(local_path):
+                return local_path, f"loaded from {local_path}"
+            raise
+    
     def _process_unitylab_logo(self, logo_path):
-        """Process UniTyLab logo to add white background"""
+        """Process UniTyLab logo to add white background (cached by content hash)"""
         try:
+            with open(logo_path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            processed_path = os.path.join(self.cache_dir, f"{digest}-white.png")
+            if os.path.exists(processed_path):
+                return processed_path
+            
+            from PIL import Image as PILImage
+            
             # Open the PNG image
             img = PILImage.open(logo_path)
             
@@ -75,20 +152,36 @@ class LogoHandler:
             # Convert back to RGB (removes transparency)
             final_img = composite.convert('RGB')
             
-            # Save to a new temp file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            final_img.save(temp_file.name, 'PNG')
-            temp_file.close()
+            # Save into the cache next to the raw logo
+            temp_path = f"{processed_path}.{os.getpid()}.tmp"
+            final_img.save(temp_path, 'PNG')
+            os.replace(temp_path, processed_path)
             
-            return temp_file.name
+            return processed_path
             
         except Exception as e:
-            print(f"⚠ Warning: Could not process UniTyLab logo: {e}")
+            logger.warning(f"⚠ Warning: Could not process UniTyLab logo: {e}")
             return logo_path  # Return original if processing fails
     
+    def _ensure_cache_dir(self):
+        """Create the cache directory, falling back to a temporary one"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"⚠ Warning: Logo cache not available ({e}), using a temporary directory")
+            self._temp_cache_dir = tempfile.mkdtemp(prefix='hhn_logos_')
+            self.cache_dir = self._temp_cache_dir
+    
+    def _read_meta(self, meta_path):
+        """Read cache metadata of one logo URL"""
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
     def cleanup_logos(self):
-        """Clean up downloaded logo files"""
-        if self.hhn_logo_path and os.path.exists(self.hhn_logo_path):
-            os.unlink(self.hhn_logo_path)
-        if self.unitylab_logo_path and os.path.exists(self.unitylab_logo_path):
-            os.unlink(self.unitylab_logo_path)
\ No newline at end of file
+        """Clean up logo files that are not kept in the persistent cache"""
+        if self._temp_cache_dir and os.path.exists(self._temp_cache_dir):
+            shutil.rmtree(self._temp_cache_dir, ignore_errors=True)
+            self._temp_cache_dir = None
@@ -0,0 +1,295 @@
+"""
+Block-level intermediate representation of parsed markdown
+"""
+
+import re
+import html
+from reportlab.platypus import Paragraph, Spacer, LongTable, TableStyle, Image, KeepTogether
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.lib import colors
+from ..core.config import Config
+from .page_tracker import AnchorTracker
+from .code_listing import CodeListing
+from .syntax_highlighter import highlight
+from .image_cache import fit_image
+from .inline_markdown import escape_markup
+from .console import get_logger
+
+logger = get_logger(__name__)
+
+
+class CachedParagraph(Paragraph):
+    """Paragraph that reuses the line breaks of earlier passes for the same width
+
+    _line_cache is shared by all paragraphs created from one block; parts
+    created by split() have their own fragments and do not use it.
+    """
+
+    _line_cache = None
+
+    def breakLines(self, width):
+        cache = self._line_cache
+        if cache is None:
+            return Paragraph.breakLines(self, width)
+
+        key = tuple(width) if isinstance(width, (list, tuple)) else width
+        entry = cache.get(key)
+        if entry is None:
+            # breakLines() may replace self.frags with processed fragments
+            entry = cache[key] = (Paragraph.breakLines(self, width), self.frags)
+        self.frags = entry[1]
+        return entry[0]
+
+    def split(self, availWidth, availHeight):
+        parts = Paragraph.split(self, availWidth, availHeight)
+        if self._line_cache and len(parts) > 1:
+            # Splitting modifies the words of the broken lines in place
+            self._line_cache.clear()
+        return parts
+
+
+class Block:
+    """A parsed markdown block rendered as a single paragraph"""
+
+    __slots__ = ('markup', 'style_name', 'space_after', '_frag_cache')
+
+    def __init__(self, markup, style_name, space_after=0):
+        self.markup = markup
+        self.style_name = style_name
+        self.space_after = space_after
+        self._frag_cache = None
+
+    def create_paragraph(self, styles):
+        """Create the paragraph, reusing parsed fragments and line breaks for the same style"""
+        style = styles[self.style_name]
+        cache = self._frag_cache
+        if cache is not None and cache[0] is style:
+            paragraph = CachedParagraph(self.markup, style, frags=cache[1])
+        else:
+            paragraph = CachedParagraph(self.markup, style)
+            cache = self._frag_cache = (style, paragraph.frags, {})
+        paragraph._line_cache = cache[2]
+        return paragraph
+
+    def to_flowables(self, styles, doc_template=None):
+        """Create fresh flowables for one layout pass"""
+        story = [self.create_paragraph(styles)]
+        if self.space_after:
+            story.append(Spacer(1, self.space_after))
+        return story
+
+
+class HeadingBlock(Block):
+    """Heading with its TOC anchor"""
+
+    __slots__ = ('level', 'text', 'anchor')
+
+    def __init__(self, level, text, anchor, markup):
+        Block.__init__(self, markup, f'Heading{min(level, 6)}Dynamic', 0.3*cm)
+        self.level = level
+        self.text = text
+        self.anchor = anchor
+
+    def to_flowables(self, styles, doc_template=None):
+        """Create heading flowables, tracking the anchor page if doc_template is given"""
+        story = []
+        if doc_template:
+            story.append(AnchorTracker(self.anchor, doc_template))
+        story.extend(Block.to_flowables(self, styles))
+        return story
+
+
+class CodeBlock(Block):
+    """Fenced code block, drawn as a CodeListing instead of a paragraph"""
+
+    __slots__ = ('lines', 'language', '_highlighted')
+
+    def __init__(self, lines, language=None):
+        Block.__init__(self, None, 'CodeBlock', 0.5*cm)
+        self.lines = lines
+        self.language = language
+        self._highlighted = None
+
+    def to_flowables(self, styles, doc_template=None):
+        """Create the listing flowable for one layout pass"""
+        if self._highlighted is None:
+            # Highlighted once per block; plain lines without Pygments or language
+            self._highlighted = highlight(self.lines, self.language) or self.lines
+        return [CodeListing(self._highlighted, styles[self.style_name]), Spacer(1, self.space_after)]
+
+
+# Size of the main frame (A4 with the LayoutEngine margins, minus the frame's
+# 6pt padding on each side) for blocks laid out without a doc template
+_DEFAULT_FRAME_WIDTH = A4[0] - 5*cm - 12
+_DEFAULT_FRAME_HEIGHT = A4[1] - 5.5*cm - 12
+_TABLE_PADDING = 6  # Left plus right cell padding
+_TABLE_VERTICAL_PADDING = 3  # Top and bottom cell padding each
+_MARKUP_TAG = re.compile(r'<[^>]*>')
+_STYLE_SUFFIXES = {'LEFT': '', 'CENTER': 'Center', 'RIGHT': 'Right'}
+
+
+class TableBlock(Block):
+    """GFM pipe table, drawn as a LongTable that repeats its header row on every page
+
+    Column widths come from the text widths of the cells, measured once per
+    block and style, instead of ReportLab's automatic sizing, which visits
+    every remaining cell again at each page break. Cells whose plain text fits
+    into their column are passed as strings, all others as paragraphs that
+    keep their fragments and line breaks between layout passes.
+    """
+
+    __slots__ = ('header', 'rows', 'alignments', '_measured')
+
+    def __init__(self, header, rows, alignments):
+        Block.__init__(self, None, 'TableCell', 0.5*cm)
+        self.header = header  # Markup per column
+        self.rows = rows  # Lists of markup with one entry per column
+        self.alignments = alignments  # 'LEFT', 'CENTER' or 'RIGHT' per column
+        self._measured = None
+
+    def _measure(self, styles):
+        """Cells as rows of (block, plain text or None, width) and the
+        (natural, minimum) width of every column"""
+        header_style = styles['TableHeader']
+        body_style = styles['TableCell']
+        measured = self._measured
+        if measured is not None and measured[0] is header_style and measured[1] is body_style:
+            return measured[2:]
+
+        columns = len(self.alignments)
+        natural = [0] * columns
+        minimum = [0] * columns
+        cells = []
+        word_widths = {}  # Table cells repeat the same words a lot
+        for row_index, row in enumerate([self.header] + self.rows):
+            style = header_style if row_index == 0 else body_style
+            style_name = 'TableHeader' if row_index == 0 else 'TableCell'
+            space_width = stringWidth(' ', style.fontName, style.fontSize)
+
+            cell_row = []
+            for column, markup in enumerate(row):
+                text = html.unescape(_MARKUP_TAG.sub('', markup))
+                width = longest = 0
+                for word in text.split():
+                    word_width = word_widths.get((word, style_name))
+                    if word_width is None:
+                        word_width = word_widths[word, style_name] = stringWidth(word, style.fontName, style.fontSize)
+                    width += word_width + space_width
+                    longest = max(longest, word_width)
+                width = max(width - space_width, 0)
+
+                natural[column] = max(natural[column], width + _TABLE_PADDING)
+                minimum[column] = max(minimum[column], longest + _TABLE_PADDING)
+                block = Block(markup, style_name + _STYLE_SUFFIXES[self.alignments[column]])
+                plain = markup if '<' not in markup and '&' not in markup else None
+                cell_row.append((block, plain, width))
+            cells.append(cell_row)
+
+        self._measured = (header_style, body_style, cells, natural, minimum)
+        return cells, natural, minimum
+
+    def column_widths(self, natural, minimum, available):
+        """Natural widths if they fit; otherwise, from the narrowest column up,
+        each column gets at most an equal share of the space still left, but
+        never less than its longest word"""
+        if sum(natural) <= available:
+            return list(natural)
+
+        widths = list(natural)
+        remaining = available
+        order = sorted(range(len(natural)), key=natural.__getitem__)
+        for count, column in enumerate(order):
+            share = remaining / (len(order) - count)
+            widths[column] = min(natural[column], max(minimum[column], share))
+            remaining -= widths[column]
+        return widths
+
+    def to_flowables(self, styles, doc_template=None):
+        """Create the table flowable for one layout pass"""
+        cells, natural, minimum = self._measure(styles)
+        available = doc_template.width - 12 if doc_template else _DEFAULT_FRAME_WIDTH
+        widths = self.column_widths(natural, minimum, available)
+
+        # Row heights are passed to the table, which otherwise recomputes them
+        # for all remaining rows after every page break
+        header_style = styles['TableHeader']
+        body_style = styles['TableCell']
+        data = []
+        heights = []
+        for row_index, cell_row in enumerate(cells):
+            row = []
+            height = (header_style if row_index == 0 else body_style).leading
+            for column, (block, plain, width) in enumerate(cell_row):
+                if plain is not None and width + _TABLE_PADDING <= widths[column]:
+                    row.append(plain)
+                else:
+                    paragraph = block.create_paragraph(styles)
+                    height = max(height, paragraph.wrap(widths[column] - _TABLE_PADDING, 0)[1])
+                    row.append(paragraph)
+            data.append(row)
+            heights.append(height + 2*_TABLE_VERTICAL_PADDING)
+
+        commands = [
+            ('FONT', (0, 0), (-1, 0), header_style.fontName, header_style.fontSize, header_style.leading),
+            ('TEXTCOLOR', (0, 0), (-1, 0), header_style.textColor),
+            ('FONT', (0, 1), (-1, -1), body_style.fontName, body_style.fontSize, body_style.leading),
+            ('TEXTCOLOR', (0, 1), (-1, -1), body_style.textColor),
+            ('BACKGROUND', (0, 0), (-1, 0), Config.COLORS['primary']),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, Config.COLORS['light_gray']]),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ]
+        for column, alignment in enumerate(self.alignments):
+            if alignment != 'LEFT':
+                commands.append(('ALIGN', (column, 0), (column, -1), alignment))
+
+        table = LongTable(data, colWidths=widths, rowHeights=heights, repeatRows=1, hAlign='LEFT',
+                          style=TableStyle(commands))
+        return [table, Spacer(1, self.space_after)]
+
+
+class EmbeddedImage(Image):
+    """Image drawn by file name (Config.IMAGE_REUSE)
+
+    ReportLab then embeds every file once and never decodes it just to
+    compare its pixels with images drawn before.
+    """
+
+    def draw(self):
+        self.canv.drawImage(
+            self.filename, getattr(self, '_offs_x', 0), getattr(self, '_offs_y', 0),
+            self.drawWidth, self.drawHeight, mask=self._mask
+        )
+
+
+class ImageBlock(Block):
+    """Image on a line of its own, fitted to the frame, with its alt text as caption"""
+
+    __slots__ = ('path', '_error')
+
+    def __init__(self, path, caption_markup):
+        Block.__init__(self, caption_markup, 'ImageCaption', 0.3*cm)
+        self.path = path
+        self._error = None
+
+    def to_flowables(self, styles, doc_template=None):
+        """Create the image (and caption) flowables for one layout pass"""
+        max_width = doc_template.width - 12 if doc_template else _DEFAULT_FRAME_WIDTH
+        max_height = doc_template.height - 12 if doc_template else _DEFAULT_FRAME_HEIGHT
+        try:
+            # Leave room for the caption below a page-high image
+            path, width, height = fit_image(self.path, max_width, max_height * 0.85)
+        except OSError as e:
+            if str(e) != self._error:
+                logger.warning(f"⚠ Warning: Could not embed image {self.path}: {e}")
+                self._error = str(e)
+            placeholder = f'<i>[Image not available: {escape_markup(self.path)}]</i>'
+            return [Paragraph(placeholder, styles['ImageCaption']), Spacer(1, self.space_after)]
+
+        self._error = None
+        image = (EmbeddedImage if Config.IMAGE_REUSE else Image)(path, width, height)
+        if not self.markup:
+            return [image, Spacer(1, self.space_after)]
+        return [KeepTogether([image, self.create_paragraph(styles)]), Spacer(1, self.space_after)]
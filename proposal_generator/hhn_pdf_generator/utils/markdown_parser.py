@@ -2,10 +2,62 @@
 Markdown to PDF content parser
 """
 
+import os
 import re
-from reportlab.platypus import Paragraph, Spacer
+from urllib.parse import unquote
 from reportlab.lib.units import cm
 from .text_utils import create_anchor_name
+from .inline_markdown import format_inline
+from .markdown_blocks import Block, HeadingBlock, CodeBlock, TableBlock, ImageBlock
+
+
+# Delimiter row below a table header, e.g. | --- | :---: | ---: |
+_TABLE_DELIMITER = re.compile(r'^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$')
+_TABLE_CELL_SEPARATOR = re.compile(r'(?<!\\)\|')
+
+# Image on a line of its own: ![alt](path), ![alt](<path>) or ![alt](path "title")
+_IMAGE = re.compile(r'^!\[([^\]]*)\]\(\s*(<[^>]*>|[^\s)]+)(?:\s+"[^"]*")?\s*\)$')
+
+# Numbered list item: the number with its dot, then the item text
+_NUMBERED_ITEM = re.compile(r'^(\d+\.)\s(.*)$')
+
+
+class DocumentInfoDetector:
+    """Detects title and subtitle while lines stream past
+    
+    The title is the first H1, the subtitle the first H2 or short text line
+    after the first H1. Fields already set (e.g. from YAML) are left alone.
+    """
+    
+    def __init__(self, document_info):
+        self.document_info = document_info
+        self.detect_title = not document_info['title']
+        self.detect_subtitle = not document_info['subtitle']
+        self.found_title = False
+    
+    @property
+    def done(self):
+        return not self.detect_title and not self.detect_subtitle
+    
+    def feed(self, line):
+        """Feed one stripped line"""
+        # Auto-detect title from first H1
+        if self.detect_title and line.startswith('# '):
+            self.document_info['title'] = line[2:].strip()
+            self.detect_title = False
+        
+        # Auto-detect subtitle from first H2 or second line after title
+        if self.detect_subtitle:
+            if line.startswith('# ') and not self.found_title:
+                self.found_title = True
+            elif self.found_title and line.startswith('## '):
+                self.document_info['subtitle'] = line[3:].strip()
+                self.detect_subtitle = False
+            elif self.found_title and line and not line.startswith('#'):
+                # Use first non-heading line as subtitle
+                if len(line) < 100:  # Reasonable subtitle length
+                    self.document_info['subtitle'] = line
+                    self.detect_subtitle = False
 
 
 class MarkdownParser:
@@ -13,105 +65,146 @@ class MarkdownParser:
     
     def __init__(self):
         self.toc_items = []
+        self.section_cache = None  # Dict of parsed sections to reuse, see scan_lines()
+        self.base_dir = None  # Directory relative image paths are resolved against
     
     def detect_document_info(self, content, document_info):
         """Automatically detect document information from markdown content"""
-        lines = content.split('\n')
-        
-        # Auto-detect title from first H1
-        if not document_info['title']:
-            for line in lines:
-                line = line.strip()
-                if line.startswith('# '):
-                    document_info['title'] = line[2:].strip()
-                    break
-        
-        # Auto-detect subtitle from first H2 or second line after title
-        if not document_info['subtitle']:
-            found_title = False
-            for line in lines:
-                line = line.strip()
-                if line.startswith('# ') and found_title == False:
-                    found_title = True
-                    continue
-                elif found_title and line.startswith('## '):
-                    document_info['subtitle'] = line[3:].strip()
-                    break
-                elif found_title and line and not line.startswith('#'):
-                    # Use first non-heading line as subtitle
-                    if len(line) < 100:  # Reasonable subtitle length
-                        document_info['subtitle'] = line
-                        break
+        detector = DocumentInfoDetector(document_info)
+        for line in content.split('\n'):
+            if detector.done:
+                break
+            detector.feed(line.strip())
         
         # If still no title, use filename (if available)
         return document_info
     
     def extract_toc_items(self, content):
         """Extract table of contents items from markdown headings"""
+        self.parse_blocks(content)
+        return self.toc_items
+    
+    def parse_blocks(self, content):
+        """Parse markdown content once into reusable blocks"""
+        return self.scan_lines(content.split('\n'))
+    
+    def scan_lines(self, lines, document_info=None):
+        """Parse markdown lines once into reusable blocks
+        
+        Lines are consumed in a single pass, so any iterable (e.g. an open file)
+        works. Every heading, including the document title, becomes a
+        HeadingBlock and a TOC item. If document_info is given, missing title
+        and subtitle are detected in the same pass. The blocks can be turned
+        into flowables for any number of layout passes with create_flowables().
+        
+        With section_cache set to a dict, each section (a heading and the lines
+        up to the next heading) is only parsed again when its text changed;
+        unchanged sections keep their blocks, including parsed fragments and
+        line breaks from earlier builds.
+        """
+        blocks = []
         self.toc_items = []
-        lines = content.split('\n')
+        cache = self.section_cache
+        used_sections = {}
+        
+        for section_lines in self._split_sections(lines, document_info):
+            if cache is None:
+                section = self._scan_section(section_lines)
+            else:
+                key = '\n'.join(section_lines)
+                section = cache.get(key) or self._scan_section(section_lines)
+                used_sections[key] = section
+            
+            blocks.extend(section[0])
+            self.toc_items.extend(section[1])
+        
+        if cache is not None:
+            # Forget sections that are no longer part of the document
+            cache.clear()
+            cache.update(used_sections)
+        
+        return blocks
+    
+    def _split_sections(self, lines, document_info=None):
+        """Group lines into sections that start at headings outside code blocks"""
+        detector = DocumentInfoDetector(document_info) if document_info is not None else None
+        in_code_block = False
+        section_lines = []
         
         for line in lines:
-            line = line.strip()
-            if line.startswith('#'):
-                # Count heading level
-                level = 0
-                for char in line:
-                    if char == '#':
-                        level += 1
-                    else:
-                        break
-                
-                # Extract heading text
-                heading_text = line[level:].strip()
-                if heading_text:
-                    self.toc_items.append({
-                        'level': level,
-                        'text': heading_text,
-                        'page': None  # Will be filled during PDF generation
-                    })
+            stripped = line.strip()
+            if detector and not detector.done:
+                detector.feed(stripped)
+            
+            if stripped.startswith('```'):
+                in_code_block = not in_code_block
+            elif not in_code_block and stripped.startswith('#') and section_lines:
+                yield section_lines
+                section_lines = []
+            section_lines.append(line)
+        
+        if section_lines:
+            yield section_lines
     
-    def parse_markdown_content(self, content, styles, document_info=None, doc_template=None):
-        """Parse markdown content dynamically"""
-        story = []
-        lines = content.split('\n')
+    def _scan_section(self, lines):
+        """Parse the lines of one section into (blocks, toc_items)
+        
+        Consecutive text lines form one paragraph; list items and quotes also
+        run over several lines, until a blank line or the next block starts.
+        A pipe table starts where a delimiter row follows a line with cells and
+        runs until the first line without a cell separator.
+        """
+        blocks = []
+        toc_items = []
         
-        i = 0
         in_code_block = False
         code_block_content = []
+        code_language = None
+        
+        # Paragraph, list item or quote still collecting lines:
+        # [style_name, space_after, prefix, lines]
+        open_block = None
+        table = None  # [header cells, alignments, rows] of a table still collecting rows
         
-        while i < len(lines):
-            line = lines[i]
+        for line in lines:
+            # Rows of an open table
+            if table:
+                stripped = line.strip()
+                if '|' in stripped and not stripped.startswith('#') and not stripped.startswith('```'):
+                    table[2].append(self._split_table_row(stripped, len(table[1])))
+                    continue
+                table = self._close_table(blocks, table)
             
             # Handle code blocks
             if line.strip().startswith('```'):
                 if in_code_block:
                     # End of code block
                     if code_block_content:
-                        code_text = '\n'.join(code_block_content)
-                        story.append(Paragraph(f"<pre>{code_text}</pre>", styles['CodeBlock']))
-                        story.append(Spacer(1, 0.5*cm))
+                        blocks.append(CodeBlock(code_block_content, code_language))
                     code_block_content = []
                     in_code_block = False
                 else:
-                    # Start of code block
+                    # Start of code block, optionally with a language (```python)
+                    open_block = self._close_block(blocks, open_block)
+                    info = line.strip()[3:].split()
+                    code_language = info[0].lower() if info else None
                     in_code_block = True
-                i += 1
                 continue
             
             if in_code_block:
                 code_block_content.append(line)
-                i += 1
                 continue
             
             line = line.strip()
             
+            # A blank line ends the open paragraph, list item or quote
             if not line:
-                i += 1
+                open_block = self._close_block(blocks, open_block)
                 continue
             
             # Handle different heading levels
             if line.startswith('#'):
+                open_block = self._close_block(blocks, open_block)
                 level = 0
                 for char in line:
                     if char == '#':
@@ -121,68 +214,137 @@ class MarkdownParser:
                 
                 heading_text = line[level:].strip()
                 if heading_text:
-                    # Skip the main title if it matches document title
-                    if level == 1 and document_info and heading_text == document_info.get('title'):
-                        i += 1
-                        continue
-                    
                     # Create anchor for linking
                     anchor_name = create_anchor_name(heading_text)
                     
-                    # Add anchor tracker if doc_template is provided
-                    if doc_template:
-                        from ..utils.page_tracker import AnchorTracker
-                        story.append(AnchorTracker(anchor_name, doc_template))
-                    
                     # Apply markdown formatting to headings
                     heading_text_formatted = self._apply_markdown_formatting(heading_text)
                     
                     # Add anchor to heading for linking
                     heading_with_anchor = f'<a name="{anchor_name}"/>{heading_text_formatted}'
                     
-                    style_name = f'Heading{min(level, 6)}Dynamic'
-                    heading_paragraph = Paragraph(heading_with_anchor, styles[style_name])
-                    story.append(heading_paragraph)
-                    
-                    # Note: toc_items are already extracted in extract_toc_items()
-                    # Do not add them again here to avoid duplicates
-                    
-                    story.append(Spacer(1, 0.3*cm))
+                    blocks.append(HeadingBlock(level, heading_text, anchor_name, heading_with_anchor))
+                    toc_items.append({
+                        'level': level,
+                        'text': heading_text,
+                        'anchor': anchor_name,
+                        'page': None  # Will be filled during PDF generation
+                    })
+            
+            # Images on a line of their own, with the alt text as caption
+            elif _IMAGE.match(line):
+                open_block = self._close_block(blocks, open_block)
+                alt_text, path = _IMAGE.match(line).groups()
+                path = unquote(path.strip('<>'))
+                if not os.path.isabs(path):
+                    path = os.path.join(self.base_dir or '', path)
+                blocks.append(ImageBlock(path, self._apply_markdown_formatting(alt_text.strip())))
+            
+            # A delimiter row turns the last line of a paragraph into a table header
+            elif (_TABLE_DELIMITER.match(line) and '|' in line and open_block
+                  and open_block[0] == 'CustomBodyText' and '|' in open_block[3][-1]
+                  and len(self._split_table_row(open_block[3][-1])) == line.strip('|').count('|') + 1):
+                header = self._split_table_row(open_block[3].pop())
+                self._close_block(blocks, open_block if open_block[3] else None)
+                open_block = None
+                alignments = []
+                for cell in line.strip('|').split('|'):
+                    cell = cell.strip()
+                    if cell.startswith(':') and cell.endswith(':'):
+                        alignments.append('CENTER')
+                    elif cell.endswith(':'):
+                        alignments.append('RIGHT')
+                    else:
+                        alignments.append('LEFT')
+                table = [header, alignments, []]
             
-            # Handle bullet points
+            # Handle bullet points (every item starts a new block)
             elif line.startswith('- ') or line.startswith('* '):
-                bullet_text = line[2:].strip()
-                bullet_text = self._apply_markdown_formatting(bullet_text)
-                story.append(Paragraph(f"• {bullet_text}", styles['BulletPoint']))
+                self._close_block(blocks, open_block)
+                open_block = ['BulletPoint', 0, "• ", [line[2:].strip()]]
             
             # Handle numbered lists
-            elif re.match(r'^\d+\.\s', line):
-                list_text = re.sub(r'^\d+\.\s', '', line)
-                list_text = self._apply_markdown_formatting(list_text)
-                story.append(Paragraph(f"{line[:line.index('.')+1]} {list_text}", styles['BulletPoint']))
+            elif _NUMBERED_ITEM.match(line):
+                self._close_block(blocks, open_block)
+                number, list_text = _NUMBERED_ITEM.match(line).groups()
+                open_block = ['BulletPoint', 0, f"{number} ", [list_text]]
             
-            # Handle quotes
+            # Handle quotes (consecutive quote lines form one block, '>' alone ends it)
             elif line.startswith('>'):
                 quote_text = line[1:].strip()
-                quote_text = self._apply_markdown_formatting(quote_text)
-                story.append(Paragraph(quote_text, styles['Quote']))
-                story.append(Spacer(1, 0.2*cm))
+                if not quote_text:
+                    open_block = self._close_block(blocks, open_block)
+                elif open_block and open_block[0] == 'Quote':
+                    open_block[3].append(quote_text)
+                else:
+                    self._close_block(blocks, open_block)
+                    open_block = ['Quote', 0.2*cm, "", [quote_text]]
             
-            # Handle regular paragraphs
+            # Continue the open block, or start a regular paragraph
+            elif open_block:
+                open_block[3].append(line)
             else:
-                text = self._apply_markdown_formatting(line)
-                story.append(Paragraph(text, styles['CustomBodyText']))
-            
-            i += 1
+                open_block = ['CustomBodyText', 0, "", [line]]
+        
+        self._close_block(blocks, open_block)
+        self._close_table(blocks, table)
+        # A fence that is never closed runs to the end of the document
+        # (_split_sections doesn't split inside it), so keep its lines
+        while code_block_content and not code_block_content[-1].strip():
+            code_block_content.pop()
+        if in_code_block and code_block_content:
+            blocks.append(CodeBlock(code_block_content, code_language))
+        return blocks, toc_items
+    
+    def _close_block(self, blocks, open_block):
+        """Append the lines collected for open_block as one Block; returns None"""
+        if open_block:
+            style_name, space_after, prefix, lines = open_block
+            text = self._apply_markdown_formatting(' '.join(lines))
+            blocks.append(Block(f"{prefix}{text}", style_name, space_after))
+        return None
+    
+    def _split_table_row(self, line, columns=None):
+        """Split a table row at unescaped pipes; pads or cuts to columns if given"""
+        if line.startswith('|'):
+            line = line[1:]
+        if line.endswith('|') and not line.endswith('\\|'):
+            line = line[:-1]
+        cells = [cell.strip().replace('\\|', '|') for cell in _TABLE_CELL_SEPARATOR.split(line)]
+        if columns is not None:
+            cells = (cells + [''] * columns)[:columns]
+        return cells
+    
+    def _close_table(self, blocks, table):
+        """Append the rows collected for table as one TableBlock; returns None"""
+        if table:
+            header, alignments, rows = table
+            format_cell = self._apply_markdown_formatting
+            blocks.append(TableBlock(
+                [format_cell(cell) for cell in header],
+                [[format_cell(cell) for cell in row] for row in rows],
+                alignments
+            ))
+        return None
+    
+    def create_flowables(self, blocks, styles, document_info=None, doc_template=None):
+        """Create fresh flowables from parsed blocks for one layout pass"""
+        story = []
+        title = document_info.get('title') if document_info else None
+        
+        for block in blocks:
+            # Skip the main title if it matches document title
+            if title and isinstance(block, HeadingBlock) and block.level == 1 and block.text == title:
+                continue
+            story.extend(block.to_flowables(styles, doc_template))
         
         return story
     
+    def parse_markdown_content(self, content, styles, document_info=None, doc_template=None):
+        """Parse markdown content dynamically"""
+        blocks = self.parse_blocks(content)
+        return self.create_flowables(blocks, styles, document_info, doc_template)
+    
     def _apply_markdown_formatting(self, text):
-        """Apply basic markdown formatting"""
-        # Bold
-        text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-        # Italic
-        text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)
-        # Inline code
-        text = re.sub(r'`(.*?)`', r'<font name="Courier">\1</font>', text)
-        return text
\ No newline at end of file
+        """Apply inline markdown formatting and escape the text for ReportLab"""
+        return format_inline(text)
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Content-addressed cache of rendered PDFs
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from .. import __version__
+from ..core.config import Config
+from .file_utils import write_file_atomic
+from .syntax_highlighter import pygments_version
+from .image_cache import file_digest
+from .console import get_logger
+
+logger = get_logger(__name__)
+
+# Config settings that change the rendered PDF. Cache directories, server,
+# worker, async and watch settings don't, so changing them keeps the cache
+# valid. A new setting that affects the output MUST be added here, or stale
+# PDFs are served after it changes. (Page geometry and fonts are constants
+# of the generator modules and covered by the version in the key.)
+KEY_SETTINGS = (
+    'OUTPUT_PROFILE', 'PDF_PAGE_COMPRESSION', 'PDF_ASCII85',
+    'IMAGE_DPI', 'IMAGE_JPEG_QUALITY', 'IMAGE_FORMAT', 'IMAGE_REUSE',
+    'COLORS', 'CODE_TOKEN_COLORS', 'DEFAULT_TABLE_LABELS', 'MAX_LAYOUT_PASSES',
+    'HHN_LOGO_URL', 'UNITYLAB_LOGO_URL',
+)
+
+
+class OutputCache:
+    """Stores rendered PDFs under a hash of everything that affects the output
+
+    The key covers the markdown text, the parsed front matter, the generator,
+    ReportLab and Pygments versions, the Config values of KEY_SETTINGS, the
+    logo bytes and the bytes of embedded images. PDFs are rendered with
+    invariant=1 so equal keys always mean equal bytes.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or Config.OUTPUT_CACHE_DIR
+
+    def compute_key(self, markdown_digest, document_state, logo_paths, image_paths=()):
+        """Compute the cache key of one document"""
+        import reportlab
+
+        hasher = hashlib.sha256()
+        hasher.update(
+            f"hhn_pdf_generator {__version__} reportlab {reportlab.Version} "
+            f"pygments {pygments_version()}\n".encode('utf-8')
+        )
+        hasher.update(markdown_digest)
+        hasher.update(json.dumps(document_state, sort_keys=True, default=str).encode('utf-8'))
+
+        for name in KEY_SETTINGS:
+            hasher.update(f"{name}={getattr(Config, name)!r}\n".encode('utf-8'))
+
+        for path in logo_paths:
+            if path and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    hasher.update(hashlib.sha256(f.read()).digest())
+            else:
+                hasher.update(b'no-logo')
+
+        for path in image_paths:
+            try:
+                hasher.update(f"{path}\0{file_digest(path)}\n".encode('utf-8'))
+            except OSError:
+                hasher.update(f"{path}\0missing\n".encode('utf-8'))
+
+        return hasher.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pdf")
+
+    def fetch(self, key, output_file):
+        """Place the cached PDF at output_file; return False on a cache miss"""
+        entry = self._entry_path(key)
+        if not os.path.exists(entry):
+            return False
+
+        if os.path.exists(output_file):
+            if os.path.samefile(entry, output_file):
+                return True
+            os.remove(output_file)
+
+        try:
+            os.link(entry, output_file)
+        except OSError:
+            # Different file system or no hard link support
+            shutil.copyfile(entry, output_file)
+        return True
+
+    def load(self, key):
+        """Bytes of the cached PDF, None on a cache miss"""
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, key, pdf_bytes):
+        """Add a rendered PDF to the cache (failures only cost a future re-render)"""
+        entry = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            write_file_atomic(entry, pdf_bytes)
+        except OSError as e:
+            logger.warning(f"⚠ Warning: Could not store PDF in output cache: {e}")
@@ -8,6 +8,9 @@ from reportlab.platypus.flowables import Flowable
 class AnchorTracker(Flowable):
     """A flowable that tracks where an anchor appears in the document"""
     
+    # Must still be drawn by LayoutOnlyFrame to record its page
+    track_in_layout = True
+    
     def __init__(self, anchor_name, doc_template):
         Flowable.__init__(self)
         self.anchor_name = anchor_name
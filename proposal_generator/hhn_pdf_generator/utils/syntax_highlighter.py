@@ -0,0 +1,155 @@
+"""
+Syntax highlighting of code blocks (requires the optional Pygments package)
+"""
+
+import os
+import json
+import hashlib
+import threading
+from ..core.config import Config
+from .file_utils import write_file_atomic
+from .console import get_logger
+
+logger = get_logger(__name__)
+
+
+# Highlighted listings of this process by cache key, shared by all documents
+# and layout passes; values are only ever replaced, never modified
+_highlight_cache = {}
+_highlight_lock = threading.Lock()
+_MAX_CACHED_LISTINGS = 256
+
+# RGB tuples by token type name, resolved once from Config.CODE_TOKEN_COLORS
+# (tuples are cheaper to set on a text object than Color objects with alpha)
+_token_colors = {}
+
+
+def pygments_version():
+    """Installed Pygments version, or None without Pygments"""
+    try:
+        import pygments
+    except ImportError:
+        return None
+    return pygments.__version__
+
+
+def _token_color(token_type):
+    """RGB color of a token type name like 'Token.Literal.String.Double'"""
+    color = _token_colors.get(token_type, False)
+    if color is False:
+        name = token_type[len('Token.'):] if token_type.startswith('Token.') else ''
+        while name and name not in Config.CODE_TOKEN_COLORS:
+            name = name.rpartition('.')[0]
+        color = Config.CODE_TOKEN_COLORS.get(name)
+        color = _token_colors[token_type] = color.rgb() if color else None
+    return color
+
+
+def _tokenize(source, language):
+    """Lex source into lines of (token_type, text) runs; None if not possible"""
+    try:
+        from pygments.lexers import get_lexer_by_name
+        from pygments.util import ClassNotFound
+    except ImportError:
+        return None
+
+    try:
+        lexer = get_lexer_by_name(language, stripnl=False, ensurenl=False)
+    except ClassNotFound:
+        return None
+
+    type_names = {}  # str() of a token type is slow, look it up once per type
+    lines = [[]]
+    line = lines[0]
+    for token_type, value in lexer.get_tokens(source):
+        name = type_names.get(token_type)
+        if name is None:
+            name = type_names[token_type] = str(token_type)
+
+        if '\n' not in value:
+            line.append((name, value))
+            continue
+
+        for index, part in enumerate(value.split('\n')):
+            if index:
+                line = []
+                lines.append(line)
+            if part:
+                line.append((name, part))
+    return lines
+
+
+def _read_tokens(path):
+    """Tokens stored by _write_tokens, None if missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        types = data['types']
+        return [[(types[index], text) for index, text in line] for line in data['lines']]
+    except (OSError, ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+def _write_tokens(path, tokens):
+    """Store tokens with token type names replaced by indexes"""
+    types = {}
+    lines = [[[types.setdefault(token_type, len(types)), text] for token_type, text in line] for line in tokens]
+    data = {'types': list(types), 'lines': lines}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_file_atomic(path, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+    except OSError as e:
+        logger.warning(f"⚠ Warning: Could not store highlighted code in token cache: {e}")
+
+
+def highlight(lines, language):
+    """Highlight code lines; returns lines of (text, rgb) runs or None
+
+    None means the listing is drawn in plain monospace: no language given,
+    Pygments missing or the language unknown. Tokens are cached in memory
+    and on disk by a hash of (Pygments version, language, source), so
+    unchanged listings are lexed once, not per pass, rebuild or process.
+    Tabs are expanded to 4 columns before lexing; a color of None means
+    the default text color.
+    """
+    if not language:
+        return None
+
+    version = pygments_version()
+    if version is None:
+        return None
+
+    source = '\n'.join(line.expandtabs(4) for line in lines)
+    key = hashlib.sha256(f"{version}\0{language}\0{source}".encode('utf-8')).hexdigest()
+    highlighted = _highlight_cache.get(key)
+    if highlighted is not None:
+        return highlighted
+
+    path = os.path.join(Config.TOKEN_CACHE_DIR, key[:2], f"{key}.json")
+    tokens = _read_tokens(path)
+    if tokens is None:
+        tokens = _tokenize(source, language)
+        if tokens is None:
+            return None
+        del tokens[len(lines):]  # Some lexers append a final newline
+        _write_tokens(path, tokens)
+
+    # Merge neighbouring runs of the same color, and whitespace into the run
+    # before it, to keep the number of runs and color switches low
+    highlighted = []
+    for line in tokens:
+        runs = []
+        for token_type, text in line:
+            color = _token_color(token_type)
+            if runs and (runs[-1][1] is color or text.isspace()):
+                runs[-1] = (runs[-1][0] + text, runs[-1][1])
+            else:
+                runs.append((text, color))
+        highlighted.append(runs)
+
+    with _highlight_lock:
+        if len(_highlight_cache) >= _MAX_CACHED_LISTINGS:
+            # Drop the oldest listing (e.g. earlier versions edited in watch mode)
+            del _highlight_cache[next(iter(_highlight_cache))]
+        _highlight_cache[key] = highlighted
+    return highlighted
@@ -2,8 +2,10 @@
 YAML front matter parser for markdown files
 """
 
-import yaml
 from ..core.config import Config
+from .console import get_logger
+
+logger = get_logger(__name__)
 
 
 class YAMLParser:
@@ -18,43 +20,56 @@ class YAMLParser:
     
     def parse_yaml_frontmatter(self, content):
         """Parse YAML front matter from markdown content and return content without front matter"""
-        lines = content.split('\n')
+        lines = iter(content.split('\n'))
+        self.read_frontmatter(lines)
+        
+        # Return content without YAML front matter
+        return '\n'.join(lines)
+    
+    def read_frontmatter(self, lines):
+        """Consume and parse the YAML front matter from an iterator of lines
         
+        The iterator is left positioned on the first line after the closing
+        '---', so the markdown body can be scanned from the same stream.
+        """
         # Check if content starts with YAML front matter
-        if not lines or lines[0].strip() != '---':
+        first_line = next(lines, None)
+        if first_line is None or first_line.strip() != '---':
             raise ValueError("YAML front matter is required! Please add a YAML header to your markdown file starting with '---'")
         
         # Find the end of YAML front matter
-        yaml_end = None
-        for i, line in enumerate(lines[1:], 1):
+        yaml_lines = []
+        for line in lines:
             if line.strip() == '---':
-                yaml_end = i
                 break
-        
-        if yaml_end is None:
+            yaml_lines.append(line)
+        else:
             raise ValueError("Malformed YAML front matter! Please ensure your YAML header ends with '---'")
         
-        # Extract YAML content
-        yaml_content = '\n'.join(lines[1:yaml_end])
+        self.parse_yaml_block('\n'.join(yaml_lines))
+    
+    def parse_yaml_block(self, yaml_content):
+        """Parse the YAML text between the front matter delimiters"""
+        import yaml
         
         try:
             # Parse YAML
             yaml_data = yaml.safe_load(yaml_content)
-            
-            if not yaml_data:
-                raise ValueError("Empty YAML front matter! Please provide student, document, and university information.")
-            
-            self._parse_student_info(yaml_data)
-            self._parse_document_info(yaml_data)
-            self._parse_university_info(yaml_data)
-            self._parse_table_labels(yaml_data)
-            self._parse_flags(yaml_data)
-        
         except yaml.YAMLError as e:
             raise ValueError(f"Error parsing YAML front matter: {e}")
         
-        # Return content without YAML front matter
-        return '\n'.join(lines[yaml_end + 1:])
+        self.parse_yaml_data(yaml_data)
+    
+    def parse_yaml_data(self, yaml_data):
+        """Load front matter that is already a dict (e.g. from a service request)"""
+        if not yaml_data:
+            raise ValueError("Empty YAML front matter! Please provide student, document, and university information.")
+        
+        self._parse_student_info(yaml_data)
+        self._parse_document_info(yaml_data)
+        self._parse_university_info(yaml_data)
+        self._parse_table_labels(yaml_data)
+        self._parse_flags(yaml_data)
     
     def _parse_student_info(self, yaml_data):
         """Parse student information from YAML data"""
@@ -74,7 +89,7 @@ class YAMLParser:
             else:
                 self.student_info[field] = "UniTyLab (University Technology Lab)"  # Default
         
-        print(f"📋 Loaded student info: {self.student_info['name']}")
+        logger.info(f"📋 Loaded student info: {self.student_info['name']}")
     
     def _parse_document_info(self, yaml_data):
         """Parse document information from YAML data"""
@@ -102,7 +117,7 @@ class YAMLParser:
             else:
                 self.document_info[field] = False  # Default to False
         
-        print(f"📄 Loaded document info: {self.document_info.get('title', 'Auto-detected')}")
+        logger.info(f"📄 Loaded document info: {self.document_info.get('title', 'Auto-detected')}")
     
     def _parse_flags(self, yaml_data):
         """Parse flags information from YAML data"""
@@ -115,7 +130,7 @@ class YAMLParser:
                 else:
                     self.flags[field] = False  # Default to False
             
-            print(f"🚩 Loaded flags: {sum(self.flags.values())} enabled")
+            logger.info(f"🚩 Loaded flags: {sum(self.flags.values())} enabled")
             
             # Merge flags into document_info for backward compatibility
             for flag, value in self.flags.items():
@@ -143,7 +158,7 @@ class YAMLParser:
             else:
                 self.university_info[field] = None
         
-        print(f"🏛️ Loaded university info: {self.university_info['name']}")
+        logger.info(f"🏛️ Loaded university info: {self.university_info['name']}")
     
     def _parse_table_labels(self, yaml_data):
         """Parse table labels from YAML data"""
@@ -157,7 +172,7 @@ class YAMLParser:
                 else:
                     self.table_labels[field] = default_label
                     
-            print(f"📋 Loaded custom table labels")
+            logger.info(f"📋 Loaded custom table labels")
         else:
             # Use default labels
             self.table_labels = Config.DEFAULT_TABLE_LABELS.copy()
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+Shared fixtures of the HHN PDF Generator tests
+
+Run from proposal_generator/:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hhn_pdf_generator.core.config import Config
+
+
+@pytest.fixture(autouse=True)
+def cache_dirs(tmp_path, monkeypatch):
+    """Keep the output, token and image caches of every test in its own directory"""
+    for setting in ('OUTPUT_CACHE_DIR', 'TOKEN_CACHE_DIR', 'IMAGE_CACHE_DIR'):
+        monkeypatch.setattr(Config, setting, str(tmp_path / setting.lower()))
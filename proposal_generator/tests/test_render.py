@@ -0,0 +1,110 @@
+"""
+Regression tests of the render pipeline: converged TOC page numbers,
+byte-identical output cache hits and reentrant concurrent renders
+"""
+
+import re
+import threading
+
+from hhn_pdf_generator.core.generator import UniversalMarkdownToPDF
+from hhn_pdf_generator.core.render import DocumentSpec, load_document, render
+from hhn_pdf_generator.generators.toc import TOCGenerator
+from hhn_pdf_generator.utils.logo_handler import LogoHandler
+
+FRONT_MATTER = """---
+student:
+  name: "Test Student"
+  student_id: "123456"
+  program: "Software Engineering"
+  specialization: "HCI"
+  supervisor: "Prof. Dr. Supervisor"
+  co_supervisor: "Prof. Dr. Co-Supervisor"
+  academic_year: "2025/2026"
+document:
+  title: "Regression Test Document"
+  type: "Master Thesis"
+  submission_date: "October 2026"
+flags:
+  toc_on_table_page: false
+  signature_line: false
+university:
+  name: "Hochschule Heilbronn"
+  subtitle: "University of Applied Sciences"
+  faculty: "Faculty IT"
+---
+"""
+
+PARAGRAPH = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt. " * 12
+
+
+def document(sections=30):
+    """Markdown with enough headings for a multi-page TOC and body"""
+    parts = [FRONT_MATTER, "# Regression Test Document\n"]
+    for i in range(1, sections + 1):
+        parts.append(f"## {i}. Section {i}\n\n{PARAGRAPH}\n")
+        if i % 3 == 0:
+            parts.append(f"### {i}.1 Details\n\n- First point\n- Second point with **bold** text\n")
+        if i % 5 == 0:
+            parts.append(f"```python\ndef section_{i}():\n    return {i}\n```\n")
+    return "\n".join(parts)
+
+
+def test_toc_page_numbers_match_heading_pages(monkeypatch):
+    printed = []
+    create_table_of_contents = TOCGenerator.create_table_of_contents
+
+    def capture(self, styles, use_actual_pages=False):
+        story = create_table_of_contents(self, styles, use_actual_pages)
+        printed.append({
+            match.group(1): int(match.group(2))
+            for match in (re.search(r'href="#([^"]+)".*<b>(\d+)</b>', getattr(flowable, 'text', '')) for flowable in story)
+            if match
+        })
+        return story
+
+    monkeypatch.setattr(TOCGenerator, 'create_table_of_contents', capture)
+    spec = DocumentSpec(document(), use_cache=False)
+    result = render(spec)
+
+    # Every heading but the document title is listed in the final TOC, with
+    # the page its anchor was drawn on in the final pass
+    assert result.passes >= 2
+    assert len(result.page_numbers) == len(load_document(spec).anchors) - 1
+    assert printed[-1] == dict(result.page_numbers)
+    assert max(printed[-1].values()) > 1
+
+
+def test_cached_generate_pdf_is_byte_identical(tmp_path):
+    input_file = tmp_path / 'document.md'
+    input_file.write_text(document(), encoding='utf-8')
+    converter = UniversalMarkdownToPDF(str(input_file), logo_handler=LogoHandler())
+
+    first = converter.generate_pdf(str(input_file), str(tmp_path / 'first.pdf'), use_cache=True)
+    assert converter.layout_passes > 0
+    second = converter.generate_pdf(str(input_file), str(tmp_path / 'second.pdf'), use_cache=True)
+    assert converter.layout_passes == 0  # Output cache hit
+
+    with open(first, 'rb') as f:
+        first_bytes = f.read()
+    with open(second, 'rb') as f:
+        assert f.read() == first_bytes
+
+
+def test_concurrent_renders_match_single_threaded():
+    spec = DocumentSpec(document(), use_cache=False)
+    expected = render(spec).pdf_bytes
+
+    results = [None, None]
+    barrier = threading.Barrier(len(results))
+
+    def worker(index):
+        barrier.wait()
+        results[index] = render(spec).pdf_bytes
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(len(results))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [expected, expected]